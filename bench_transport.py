@@ -0,0 +1,152 @@
+import argparse
+import csv
+import io
+import json
+import random
+import time
+import tracemalloc
+
+import queries
+
+
+# =====================================================
+# TRANSPORT BENCHMARK (JSON vs CSV)
+# -----------------------------------------------------
+# จำลองผล rpc_lot_kanban_circuits / rpc_part_tracking_lot_harness ขนาดใหญ่
+# เทียบ path เดิม (json.loads -> list[dict] -> DataFrame)
+# กับ path ใหม่ (text/csv -> read_csv ตาม dtype) ใน queries.py
+#
+#   python bench_transport.py --rows 50000 --repeat 5
+#
+# รายงาน: ขนาด payload, เวลา decode (median), peak memory ระหว่าง decode
+# =====================================================
+DATASETS = {
+    "circuits": queries.CIRCUIT_COLS,
+    "tracking": queries.TRACKING_COLS,
+    "plan": queries.PLAN_COLS,
+}
+
+
+def build_rows(cols, n, rng):
+    rows = []
+    for i in range(n):
+        row = {}
+        for c, kind in cols.items():
+            if kind == queries.NUMBER:
+                row[c] = rng.randint(1, 500) if rng.random() > 0.1 else None
+            elif kind == queries.BOOL:
+                row[c] = rng.random() < 0.4
+            elif c.startswith("delivered_at") or c.endswith("_at"):
+                row[c] = (
+                    f"2026-10-{rng.randint(1, 28):02d}T0{rng.randint(0, 9)}:"
+                    f"{rng.randint(0, 59):02d}:00+00:00"
+                    if rng.random() < 0.4 else None
+                )
+            else:
+                row[c] = f"{c[:4].upper()}{i % 997:05d}"
+        rows.append(row)
+    return rows
+
+
+def to_json(rows):
+    return json.dumps(rows)
+
+
+def to_csv(rows, cols):
+    # รูปแบบเดียวกับ PostgREST : null = ช่องว่าง, boolean = true/false
+    buf = io.StringIO()
+    w = csv.writer(buf, lineterminator="\n")
+    w.writerow(list(cols))
+    for r in rows:
+        w.writerow([
+            "" if r[c] is None
+            else ("true" if r[c] else "false") if isinstance(r[c], bool)
+            else r[c]
+            for c in cols
+        ])
+    return buf.getvalue()
+
+
+def measure(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return sorted(times)[len(times) // 2], peak
+
+
+def run(name, rows, repeat, rng):
+    cols = DATASETS[name]
+    data = build_rows(cols, rows, rng)
+    body_json = to_json(data)
+    body_csv = to_csv(data, cols)
+    del data
+
+    json_ms, json_peak = measure(
+        lambda: queries.decode_json(json.loads(body_json), cols), repeat
+    )
+    csv_ms, csv_peak = measure(
+        lambda: queries.decode_csv(body_csv, cols), repeat
+    )
+
+    return {
+        "dataset": name,
+        "rows": rows,
+        "json": {
+            "payload_kb": round(len(body_json.encode()) / 1024, 1),
+            "decode_ms": round(json_ms, 1),
+            "peak_mb": round(json_peak / 2**20, 1),
+        },
+        "csv": {
+            "payload_kb": round(len(body_csv.encode()) / 1024, 1),
+            "decode_ms": round(csv_ms, 1),
+            "peak_mb": round(csv_peak / 2**20, 1),
+        },
+    }
+
+
+def print_report(results):
+    print(
+        f"{'dataset':<10} {'rows':>8} {'format':<6} "
+        f"{'payload KB':>11} {'decode ms':>10} {'peak MB':>8}"
+    )
+    for r in results:
+        for fmt in ("json", "csv"):
+            s = r[fmt]
+            print(
+                f"{r['dataset']:<10} {r['rows']:>8} {fmt:<6} "
+                f"{s['payload_kb']:>11} {s['decode_ms']:>10} {s['peak_mb']:>8}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON vs CSV transport benchmark")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--dataset", choices=list(DATASETS), action="append",
+                        help="default = ทุกชุด")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    results = [
+        run(name, args.rows, args.repeat, rng)
+        for name in (args.dataset or list(DATASETS))
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import threading
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import streamlit as st
+from supabase import ClientOptions, create_client
+
+
+# =====================================================
+# ONE-TIME SETUP (cache ทั้ง process ไม่ทำซ้ำทุก rerun)
+# =====================================================
+@st.cache_resource
+def get_supabase():
+    return create_client(
+        st.secrets["SUPABASE_URL"],
+        st.secrets["SUPABASE_KEY"],
+        # เพดาน HTTP ต่อ request (เดิม 120 s) -> thread ไม่ค้างนาน
+        options=ClientOptions(
+            postgrest_client_timeout=get_config()["db_timeout_sec"]
+        )
+    )
+
+
+@st.cache_resource
+def get_config():
+    return {
+        # ตั้ง LOCAL_REPLICA_PATH ใน secrets เพื่อเปิดใช้ snapshot ในเครื่อง
+        "replica_path": st.secrets.get("LOCAL_REPLICA_PATH"),
+        "replica_sync_sec": int(st.secrets.get("LOCAL_REPLICA_SYNC_SEC", 60)),
+        # ตั้ง SCAN_SERVICE_URL เมื่อใช้ scan_server.py รับสแกน (หน้า Scan แสดงผลอย่างเดียว)
+        "scan_service_url": (st.secrets.get("SCAN_SERVICE_URL") or "").rstrip("/"),
+        # ผลลัพธ์ขนาดใหญ่ (plan / circuits / tracking) : csv | json
+        "transport_format": st.secrets.get("TRANSPORT_FORMAT", "csv"),
+        # cache ร่วมทุก session + warm-up ต้นกะ (เวลาไทย คั่นด้วย ,)
+        "cache_ttl_sec": int(st.secrets.get("CACHE_TTL_SEC", 120)),
+        "cache_max_mb": float(st.secrets.get("CACHE_MAX_MB", 512)),
+        "warmup_times": st.secrets.get("WARMUP_TIMES", "08:00,20:00"),
+        "warmup_window_min": int(st.secrets.get("WARMUP_WINDOW_MIN", 30)),
+        # read ของ dashboard : timeout / breaker (resilience.py)
+        "db_timeout_sec": float(st.secrets.get("DB_TIMEOUT_SEC", 30)),
+        "read_timeout_sec": float(st.secrets.get("READ_TIMEOUT_SEC", 10)),
+        "slow_call_sec": float(st.secrets.get("SLOW_CALL_SEC", 5)),
+        "breaker_trip_after": int(st.secrets.get("BREAKER_TRIP_AFTER", 3)),
+        "breaker_cooldown_sec": float(st.secrets.get("BREAKER_COOLDOWN_SEC", 30)),
+        # Upload Lot Master : background job + checkpoint ในเครื่อง (upload_jobs.py)
+        "upload_job_dir": st.secrets.get("UPLOAD_JOB_DIR", ".upload_jobs"),
+        "upload_chunk_rows": int(st.secrets.get("UPLOAD_CHUNK_ROWS", 500)),
+    }
+
+
+@st.cache_resource
+def setup_resilience():
+    import datacache
+    import resilience
+
+    config = get_config()
+    datacache.configure(config["cache_ttl_sec"], config["cache_max_mb"])
+    resilience.configure(
+        config["read_timeout_sec"],
+        config["slow_call_sec"],
+        config["breaker_trip_after"],
+        config["breaker_cooldown_sec"]
+    )
+    return True
+
+
+def freshness_badge(result):
+    # ผลจาก resilience.read : cache หมดอายุ (กำลังโหลดใหม่เบื้องหลัง)
+    # / DB ช้า / breaker เปิด -> แสดงข้อมูลล่าสุดที่ดีพร้อมเวลา
+    if not result["stale"]:
+        return
+
+    as_of = datetime.fromtimestamp(result["as_of"], ZoneInfo("Asia/Bangkok"))
+    if not result["error"]:
+        st.caption(
+            f"🕒 ข้อมูล ณ {as_of:%H:%M:%S} | กำลังโหลดข้อมูลใหม่เบื้องหลัง "
+            f"(rerun / กด 🔄 Refresh เพื่อดูชุดใหม่)"
+        )
+        return
+
+    st.warning(
+        f"🕒 ข้อมูล ณ {as_of:%Y-%m-%d %H:%M:%S} | "
+        f"DB ตอบช้า / ไม่ตอบ -> แสดงข้อมูลล่าสุดที่โหลดได้ ({result['error']})"
+    )
+
+
+@st.cache_resource
+def start_warmup():
+    config = get_config()
+    client = get_supabase()
+
+    def boot():
+        # import pandas ใน thread นี้ -> cold start หน้า Scan ไม่ต้องรอ
+        # (queries import pandas -> ตั้ง transport format ที่นี่ ไม่ใช่ใน script หลัก)
+        # หน้าอื่นที่ยิงก่อนตั้งเสร็จได้ค่า default csv (endpoint ไหนไม่รับ -> fallback JSON เอง)
+        import queries
+        import warmup
+
+        queries.set_format(config["transport_format"])
+
+        warmup.schedule(
+            client,
+            config["warmup_times"],
+            config["warmup_window_min"],
+            config["cache_ttl_sec"]
+        )
+
+    threading.Thread(target=boot, daemon=True, name="warmup-scheduler").start()
+    return True
+
+
+# =====================================================
+# LOCAL READ REPLICA (OPTIONAL)
+# =====================================================
+@st.cache_resource
+def start_replica():
+    path = get_config()["replica_path"]
+    if not path:
+        return None
+
+    import replica
+
+    replica.start_sync_thread(
+        get_supabase(),
+        path,
+        get_config()["replica_sync_sec"]
+    )
+    return path
+
+
+def use_replica():
+    path = get_config()["replica_path"]
+    if not path:
+        return False
+
+    import replica
+
+    return replica.is_ready(path)
+
+
+def replica_caption():
+    import replica
+
+    synced = replica.synced_at(get_config()["replica_path"])
+    return (
+        f"📊 Source: local replica (lot_master + kanban_delivery) | "
+        f"synced {synced:%Y-%m-%d %H:%M:%S}"
+    )
+
+
+@st.cache_resource
+def start_upload_jobs():
+    # job ที่ค้างจาก process ก่อน -> ทำต่อจาก checkpoint
+    import upload_jobs
+
+    config = get_config()
+    upload_jobs.configure(config["upload_job_dir"], config["upload_chunk_rows"])
+    return upload_jobs.resume_all(get_supabase())
@@ -0,0 +1,178 @@
+import collections
+import sys
+import threading
+import time
+
+
+# =====================================================
+# SHARED DATA CACHE (ใช้ร่วมทุก session ใน process)
+# -----------------------------------------------------
+# key เช่น ("plan", date_from, date_to) / ("circuits", lot_no)
+# warm-up (warmup.py) เติมไว้ล่วงหน้า -> session แรกของกะไม่ต้องรอ DB
+# โหลดผ่าน resilience เท่านั้น (single-flight / breaker / timeout อยู่ที่นั่น)
+#
+# หน่วยความจำ : รวมทุก entry ไม่เกิน MAX_BYTES (CACHE_MAX_MB)
+#   เกิน -> ทิ้ง entry ที่ไม่ได้ใช้นานที่สุดก่อน (LRU ตามขนาด byte)
+#   session ได้ DataFrame แบบ view (copy-on-write) ไม่ใช่สำเนา
+#   -> เปิดกี่ tab ข้อมูลก้อนเดียวกันก็มีชุดเดียว, แก้ใน session ไม่กระทบ cache
+# =====================================================
+TTL_SEC = 120
+MAX_BYTES = 512 * 2**20
+
+_store = collections.OrderedDict()      # key -> {"value", "at", "bytes"} (เก่าสุดอยู่หน้า)
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+_cow = False
+
+
+def configure(ttl_sec=None, max_mb=None):
+    global TTL_SEC, MAX_BYTES
+    if ttl_sec:
+        TTL_SEC = int(ttl_sec)
+    if max_mb:
+        MAX_BYTES = int(float(max_mb) * 2**20)
+        with _lock:
+            _evict()
+
+
+# =====================================================
+# SIZE / VIEW
+# -----------------------------------------------------
+# pandas ไม่ import ที่นี่ (หน้า Scan ใช้ resilience -> datacache)
+# ถ้ามี DataFrame ใน cache แปลว่า pandas ถูก import แล้ว
+# =====================================================
+def _pandas():
+    return sys.modules.get("pandas")
+
+
+def _enable_cow(pd):
+    # pandas 3 เป็น copy-on-write อยู่แล้ว, pandas 2 ต้องเปิดเอง
+    global _cow
+    if not _cow:
+        if int(pd.__version__.split(".")[0]) < 3:
+            pd.set_option("mode.copy_on_write", True)
+        _cow = True
+
+
+def sizeof(value):
+    pd = _pandas()
+    if pd is not None and isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if pd is not None and isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            sizeof(k) + sizeof(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def view(value):
+    # DataFrame -> shallow copy (ใช้ buffer ร่วม, เขียนเมื่อไหร่ค่อย copy เฉพาะส่วนนั้น)
+    pd = _pandas()
+    if pd is not None and isinstance(value, (pd.DataFrame, pd.Series)):
+        _enable_cow(pd)
+        return value.copy(deep=False)
+    if isinstance(value, dict):
+        return {k: view(v) for k, v in value.items()}
+    return value
+
+
+def _evict(keep=None):
+    # เรียกตอนถือ _lock
+    while _stats["bytes"] > MAX_BYTES and len(_store) > 1:
+        key = next(iter(_store))
+        if key == keep:
+            _store.move_to_end(key)
+            key = next(iter(_store))
+        _stats["bytes"] -= _store.pop(key)["bytes"]
+        _stats["evictions"] += 1
+
+
+# =====================================================
+# GET / PUT
+# =====================================================
+def record(hit):
+    with _lock:
+        _stats["hits" if hit else "misses"] += 1
+
+
+def entry(key):
+    # รวมที่หมดอายุแล้ว (resilience.read ใช้เป็นข้อมูลสำรอง) / ไม่นับ hit-miss
+    with _lock:
+        e = _store.get(key)
+        if e is None:
+            return None
+        _store.move_to_end(key)
+    return {"value": view(e["value"]), "at": e["at"]}
+
+
+def put(key, value):
+    return put_entry(key, value)["value"]
+
+
+def put_entry(key, value):
+    size = sizeof(value)
+    e = {"value": value, "at": time.time(), "bytes": size}
+
+    with _lock:
+        old = _store.pop(key, None)
+        if old:
+            _stats["bytes"] -= old["bytes"]
+        _store[key] = e
+        _stats["bytes"] += size
+        _evict(keep=key)
+
+    return {"value": view(value), "at": e["at"]}
+
+
+def loaded_at(key):
+    with _lock:
+        e = _store.get(key)
+    return e["at"] if e else None
+
+
+def invalidate(key=None):
+    with _lock:
+        if key is None:
+            _store.clear()
+            _stats["bytes"] = 0
+        else:
+            old = _store.pop(key, None)
+            if old:
+                _stats["bytes"] -= old["bytes"]
+
+
+def keys():
+    with _lock:
+        return list(_store)
+
+
+# =====================================================
+# STATS (หน้า Admin)
+# =====================================================
+def stats():
+    with _lock:
+        total = _stats["hits"] + _stats["misses"]
+        return {
+            **_stats,
+            "entries": len(_store),
+            "max_bytes": MAX_BYTES,
+            "hit_rate": round(_stats["hits"] / total * 100, 1) if total else 0.0,
+        }
+
+
+def entries():
+    # เรียงจากใช้ล่าสุด -> เก่าสุด (ตัวแรกที่จะถูกทิ้งอยู่ท้าย)
+    now = time.time()
+    with _lock:
+        return [
+            {
+                "key": " | ".join(map(str, k)),
+                "kb": round(e["bytes"] / 1024, 1),
+                "age_sec": round(now - e["at"]),
+            }
+            for k, e in reversed(_store.items())
+        ]
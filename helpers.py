@@ -0,0 +1,40 @@
+# =====================================================
+# HELPERS
+# -----------------------------------------------------
+# pandas import ภายในฟังก์ชัน -> หน้า Scan Kanban ไม่ต้องโหลด pandas
+# =====================================================
+
+
+# =====================================================
+# TIMEZONE (GMT+7)
+# =====================================================
+def to_gmt7(ts):
+    import pandas as pd
+
+    if not ts or pd.isna(ts):
+        return ""
+    return (
+        pd.to_datetime(ts, utc=True)          # บอกว่าเป็น UTC
+          .tz_convert("Asia/Bangkok")         # แปลงเป็นเวลาไทย
+          .strftime("%Y-%m-%d %H:%M:%S")
+    )
+
+
+def safe_df(data, cols=None):
+    import pandas as pd
+
+    if data:
+        return pd.DataFrame(data)
+    return pd.DataFrame(columns=cols or [])
+
+def norm(x):
+    return str(x).strip() if x is not None else ""
+
+def norm_lot(x):
+    if x is None:
+        return ""
+
+    s = str(x).strip().upper()
+    if s.endswith(".0"):       # เลข lot ที่ Excel แปลงเป็น float
+        s = s[:-2]
+    return s.replace(" ", "").replace("-", "")
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+
+# =====================================================
+# LOT CIRCUITS : FETCH ครั้งเดียว -> FILTER ในเครื่อง
+# -----------------------------------------------------
+# index = {ค่า (lower) -> ตำแหน่งแถว} ต่อคอลัมน์
+# filter แบบ "มีคำนี้อยู่" เช็คเฉพาะค่า distinct แล้วรวมตำแหน่ง
+# ไม่ต้อง scan string ทุกแถว
+# =====================================================
+INDEX_COLS = {
+    "model": "model_name",
+    "wire": "wire_number",
+    "part": "harness_part_no",
+}
+
+
+def build(df):
+    df = df.reset_index(drop=True)
+
+    index = {}
+    for key, col in INDEX_COLS.items():
+        values = df[col].fillna("").astype(str).str.strip().str.lower()
+        index[key] = {
+            v: np.asarray(pos)
+            for v, pos in values.groupby(values).indices.items()
+        }
+
+    if "delivered_at_gmt7" in df.columns:
+        sent = df["delivered_at_gmt7"].notna() & (
+            df["delivered_at_gmt7"].astype(str).str.strip() != ""
+        )
+    else:
+        sent = pd.Series(False, index=df.index)
+
+    return {
+        "df": df,
+        "index": index,
+        "sent": sent.to_numpy(dtype=bool),
+    }
+
+
+def _mask(frame, model=None, wire=None, part=None):
+    mask = np.ones(len(frame["df"]), dtype=bool)
+
+    for key, text in (("model", model), ("wire", wire), ("part", part)):
+        text = (text or "").strip().lower()
+        if not text:
+            continue
+
+        hit = np.zeros(len(mask), dtype=bool)
+        for value, pos in frame["index"][key].items():
+            if text in value:
+                hit[pos] = True
+        mask &= hit
+
+    return mask
+
+
+def kpi(frame, wire=None, part=None):
+    # เงื่อนไขเดียวกับ rpc_part_kpi (lot + wire + part)
+    mask = _mask(frame, wire=wire, part=part)
+    total = int(mask.sum())
+    sent = int((mask & frame["sent"]).sum())
+
+    return {
+        "total_kanban": total,
+        "sent_kanban": sent,
+        "remaining_kanban": total - sent,
+    }
+
+
+def kpi_by_lot(frame, wire=None, part=None):
+    # kpi() ต่อ lot ในครั้งเดียว (โหมดหลาย Lot)
+    mask = _mask(frame, wire=wire, part=part)
+    counts = pd.DataFrame({
+        "lot_no": frame["df"]["lot_no"],
+        "total_kanban": mask.astype(int),
+        "sent_kanban": (mask & frame["sent"]).astype(int),
+    }).groupby("lot_no", sort=False).sum()
+
+    counts["remaining_kanban"] = counts["total_kanban"] - counts["sent_kanban"]
+    return counts
+
+
+def apply(frame, model=None, wire=None, part=None, status="ALL"):
+    mask = _mask(frame, model, wire, part)
+    if status == "SENT":
+        mask &= frame["sent"]
+    elif status == "REMAIN":
+        mask &= ~frame["sent"]
+
+    return frame["df"][mask]
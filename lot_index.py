@@ -0,0 +1,90 @@
+import bisect
+
+from postgrest.exceptions import APIError
+
+from helpers import norm_lot
+
+
+# =====================================================
+# LOT KEY INDEX
+# -----------------------------------------------------
+# key = norm_lot(lot)  ("lot-2601 05.0" -> "LOT260105")
+# พิมพ์ขีด / เว้นวรรค / .0 จาก Excel ก็ยังหา lot จริงเจอ
+# =====================================================
+PAGE_SIZE = 1000
+
+
+def fetch_lots(client):
+    # sql/v_lot_no.sql : distinct ฝั่ง DB -> แถวละ lot
+    # ยังไม่ได้ติดตั้ง view -> page ผ่าน lot_master (แถวละ kanban) แบบเดิม
+    try:
+        return _fetch_distinct(client, "v_lot_no")
+    except APIError:
+        return _fetch_distinct(client, "lot_master")
+
+
+def _fetch_distinct(client, table):
+    lots = set()
+    start = 0
+    while True:
+        rows = (
+            client.table(table)
+            .select("lot_no")
+            .order("lot_no")
+            .range(start, start + PAGE_SIZE - 1)
+            .execute()
+            .data
+        ) or []
+
+        lots.update(r["lot_no"] for r in rows if r.get("lot_no"))
+
+        if len(rows) < PAGE_SIZE:
+            break
+        start += PAGE_SIZE
+
+    return sorted(lots)
+
+
+def build(lots):
+    by_key = {}
+    for lot in lots:
+        key = norm_lot(lot)
+        if key:
+            by_key.setdefault(key, []).append(lot)
+
+    return {
+        "keys": sorted(by_key),
+        "lots": by_key,
+    }
+
+
+def resolve(index, text):
+    return index["lots"].get(norm_lot(text), [])
+
+
+def complete(index, text, limit=20):
+    prefix = norm_lot(text)
+    if not prefix:
+        return []
+
+    keys = index["keys"]
+    out = []
+    i = bisect.bisect_left(keys, prefix)
+    while i < len(keys) and keys[i].startswith(prefix) and len(out) < limit:
+        out.extend(index["lots"][keys[i]])
+        i += 1
+
+    return out[:limit]
+
+
+def lookup(index, text, limit=20):
+    # คืน (lot ที่ resolve ได้ หรือ None, รายการตัวเลือก)
+    exact = resolve(index, text)
+    if len(exact) == 1:
+        return exact[0], exact
+
+    candidates = exact or complete(index, text, limit)
+    if len(candidates) == 1:
+        return candidates[0], candidates
+
+    return None, candidates
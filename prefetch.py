@@ -0,0 +1,162 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import pandas as pd
+
+import datacache
+import queries
+import resilience
+import scan_logic
+
+
+# =====================================================
+# DRILL-DOWN PREFETCH (rpc_lot_kanban_circuits_multi)
+# -----------------------------------------------------
+# ทุก lot ใน plan ที่แสดง -> 1 call (multi-lot, paged ผ่าน queries.fetch_paged)
+# แยกเก็บทีละ lot ใน datacache key ("circuits", lot)
+#   = key เดียวกับหน้า Lot Kanban Summary / warm-up -> ข้อมูลชุดเดียวใช้ได้ทั้งสองหน้า
+# drill-down แยกตาม part ในเครื่อง (คอลัมน์เดียวกับ rpc_part_tracking_lot_harness)
+# หน้า Delivery Plan เรียก prefetch ครั้งเดียวต่อชุด plan (ไม่ใช่ทุก rerun)
+# โหลดผ่าน resilience (breaker + single-flight) ด้วย executor ของตัวเอง
+#   -> prefetch 50 lot ไม่ไปต่อคิวหน้า dashboard
+# =====================================================
+MAX_LOTS = 50
+NAME = "rpc_lot_kanban_circuits_multi"
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+_pending = {}       # lot -> future ของ call ชุดที่กำลังโหลด lot นั้น
+_lock = threading.Lock()
+
+
+def _key(lot_no):
+    return ("circuits", lot_no)
+
+
+def _fresh(lot_no):
+    at = datacache.loaded_at(_key(lot_no))
+    return at is not None and time.time() - at < datacache.TTL_SEC
+
+
+def split(df, lots, seq):
+    # ผล multi-lot -> entry ต่อ lot (lot ที่ไม่มีวงจรได้ frame ว่าง)
+    parts = dict(iter(df.groupby("lot_no", sort=False)))
+    return {
+        lot: {
+            "df": parts.get(lot, df.iloc[0:0]).reset_index(drop=True),
+            "delivery_seq": seq,
+        }
+        for lot in lots
+    }
+
+
+def _fetch(client, lots):
+    # seq ก่อนยิง query -> การส่งระหว่างโหลดยังถูกจับได้ (หน้า Lot Kanban Summary)
+    seq = scan_logic.delivery_seq()
+    return split(queries.lot_circuits_multi(client, lots), lots, seq)
+
+
+def _load(client, lots):
+    for lot, entry in _fetch(client, lots).items():
+        datacache.put(_key(lot), entry)
+    return lots
+
+
+def _submit(client, lots, fresh=False):
+    # คืน future ของ call (None = ทุก lot ยังสดอยู่) / breaker เปิด -> Unavailable
+    lots = tuple(
+        lot for lot in list(dict.fromkeys(lots))[:MAX_LOTS]
+        if fresh or not _fresh(lot)
+    )
+    if not lots:
+        return None
+    future = resilience.revalidate(
+        NAME, ("prefetch", lots), lambda: _load(client, lots), executor=_executor
+    )
+
+    with _lock:
+        _pending.update(dict.fromkeys(lots, future))
+
+    def done(f):
+        with _lock:
+            for lot in lots:
+                if _pending.get(lot) is f:
+                    del _pending[lot]
+
+    future.add_done_callback(done)
+    return future
+
+
+def prefetch(client, lots):
+    # หน้า Delivery Plan : ยิงแล้วไม่รอ / breaker เปิด -> ข้าม (drill-down แจ้งเอง)
+    try:
+        return _submit(client, lots)
+    except resilience.Unavailable:
+        return None
+
+
+def wait(client, lots, timeout=None, fresh=False):
+    # warm-up : โหลด (fresh = ทุก lot) แล้วรอ คืน entry ของ lot ที่อยู่ใน cache
+    # breaker เปิด / timeout / พัง -> raise ให้ warm-up บันทึกเป็น error ของ step
+    future = _submit(client, lots, fresh)
+    if future is not None:
+        future.result(timeout=timeout)
+
+    out = {}
+    for lot in list(dict.fromkeys(lots))[:MAX_LOTS]:
+        e = datacache.entry(_key(lot))
+        if e is not None:
+            out[lot] = e["value"]
+    return out
+
+
+def tracking(df):
+    # วงจรของ lot -> คอลัมน์แบบ rpc_part_tracking_lot_harness (หน้า drill-down เดิม)
+    delivered = df["delivered_at_gmt7"]
+    return pd.DataFrame({
+        "lot_no": df["lot_no"],
+        "kanban_no": df["kanban_no"],
+        "model_name": df["model_name"],
+        "harness_part_no": df["harness_part_no"],
+        "wire_number": df["wire_number"],
+        "sent": df["status"] == "SENT",
+        # เวลาไทยจาก RPC -> ใส่ offset ให้ to_gmt7 แปลงได้ถูก
+        "delivered_at": delivered.where(delivered.isna(), delivered + "+07:00"),
+    })
+
+
+def get(client, lot_no, part_no, timeout=None):
+    # lot อยู่ในชุดที่กำลัง prefetch -> รอชุดนั้น (ไม่ยิง lot เดียวซ้อน)
+    with _lock:
+        future = _pending.get(lot_no)
+    if future is not None and not is_ready(lot_no):
+        timeout = timeout or resilience.TIMEOUT_SEC
+        try:
+            future.result(timeout=timeout)
+        except FutureTimeout:
+            raise resilience.Unavailable(f"{NAME}: timeout after {timeout:g}s")
+        except Exception:
+            pass    # ชุดพัง -> โหลด lot เดียวด้านล่าง
+
+    # หมดอายุ -> ได้ผลเก่าทันที + โหลดใหม่เบื้องหลัง / ไม่มีเลย -> โหลด lot เดียว
+    entry = resilience.read(
+        NAME, _key(lot_no),
+        lambda: _fetch(client, [lot_no])[lot_no],
+        timeout=timeout
+    )["value"]
+
+    df = entry["df"]
+    return tracking(df[df["harness_part_no"] == part_no].reset_index(drop=True))
+
+
+def is_ready(lot_no):
+    return datacache.loaded_at(_key(lot_no)) is not None
+
+
+def invalidate(lot_no=None):
+    if lot_no is not None:
+        datacache.invalidate(_key(lot_no))
+        return
+    for key in datacache.keys():
+        if key[0] in ("circuits", "prefetch"):
+            datacache.invalidate(key)
@@ -0,0 +1,218 @@
+import io
+import threading
+
+import pandas as pd
+from postgrest.exceptions import APIError
+
+
+# =====================================================
+# DATA ACCESS (ผลลัพธ์ขนาดใหญ่)
+# -----------------------------------------------------
+# ขอผลเป็น CSV (Accept: text/csv) แล้ว read_csv ตรงเป็น DataFrame
+# ตาม dtype ที่กำหนด -> ไม่ต้องสร้าง list[dict] จาก JSON ก่อน
+# ถ้า endpoint ไหนส่ง CSV ไม่ได้ -> fallback JSON แล้วจำไว้
+# =====================================================
+FORMAT = "csv"
+
+# PostgREST / Supabase ตัดผลที่ max-rows (default 1000) โดยไม่แจ้ง error
+# ผลที่อาจเกิน -> fetch_paged ขอทีละ PAGE_SIZE จนได้ page ไม่เต็ม
+PAGE_SIZE = 1000
+
+_csv_unsupported = set()
+_lock = threading.Lock()
+
+TEXT, NUMBER, BOOL = "text", "number", "bool"
+
+PLAN_COLS = {
+    "lot_no": TEXT,
+    "part_number": TEXT,
+    "part_name": TEXT,
+    "model_level": TEXT,
+    "plan_delivery_dt": TEXT,
+    "plan_assembly_date": TEXT,
+    "remark": TEXT,
+    "plan_qty": NUMBER,
+    "actual_qty": NUMBER,
+    "last_delivered_at": TEXT,
+}
+
+CIRCUIT_COLS = {
+    "lot_no": TEXT,
+    "kanban_no": TEXT,
+    "model_name": TEXT,
+    "harness_part_no": TEXT,
+    "wire_number": TEXT,
+    "wire_harness_code": TEXT,
+    "subpackage_number": TEXT,
+    "cable_name": TEXT,
+    "wire_length_mm": TEXT,
+    "joint_a": TEXT,
+    "joint_b": TEXT,
+    "mc_a": TEXT,
+    "mc_b": TEXT,
+    "twist_mc": TEXT,
+    "status": TEXT,
+    "delivered_at_gmt7": TEXT,
+}
+
+TRACKING_COLS = {
+    "lot_no": TEXT,
+    "kanban_no": TEXT,
+    "model_name": TEXT,
+    "harness_part_no": TEXT,
+    "wire_number": TEXT,
+    "sent": BOOL,
+    "delivered_at": TEXT,
+}
+
+_BOOL_MAP = {"t": True, "true": True, "f": False, "false": False}
+
+
+def set_format(fmt):
+    global FORMAT
+    FORMAT = "json" if str(fmt).lower() == "json" else "csv"
+
+
+# =====================================================
+# DECODE
+# =====================================================
+def _typed(df, cols):
+    for c, kind in cols.items():
+        if c not in df.columns:
+            df[c] = None
+        if kind == NUMBER:
+            df[c] = pd.to_numeric(df[c], errors="coerce")
+        elif kind == BOOL:
+            # CSV ได้ "t"/"f", JSON ได้ True/False
+            df[c] = (
+                df[c].astype(str).str.lower()
+                     .map(_BOOL_MAP).fillna(False).astype(bool)
+            )
+        else:
+            # text : null = None (เหมือนผล JSON)
+            df[c] = df[c].astype(object).where(df[c].notna(), None)
+    return df
+
+
+def decode_csv(text, cols):
+    if not text or not isinstance(text, str):
+        return pd.DataFrame({c: pd.Series(dtype=object) for c in cols})
+
+    dtype = {c: str for c, kind in cols.items() if kind != NUMBER}
+    df = pd.read_csv(
+        io.StringIO(text),
+        dtype=dtype,
+        keep_default_na=False,
+        na_values={c: [""] for c in cols},
+    )
+    return _typed(df, cols)
+
+
+def decode_json(data, cols):
+    if not data:
+        return pd.DataFrame({c: pd.Series(dtype=object) for c in cols})
+    return _typed(pd.DataFrame(data), cols)
+
+
+def fetch_frame(name, make_query, cols):
+    # make_query() ต้องสร้าง builder ใหม่ทุกครั้ง (builder ใช้ซ้ำไม่ได้)
+    with _lock:
+        use_csv = FORMAT == "csv" and name not in _csv_unsupported
+
+    if use_csv:
+        try:
+            builder = make_query()
+            builder.request.headers["Accept"] = "text/csv"
+            data = builder.execute().data
+            if isinstance(data, list):
+                # server ไม่สนใจ Accept แล้วส่ง JSON กลับมา
+                return decode_json(data, cols)
+            return decode_csv(data, cols)
+        except APIError:
+            with _lock:
+                _csv_unsupported.add(name)
+
+    return decode_json(make_query().execute().data, cols)
+
+
+def fetch_paged(name, make_query, cols):
+    # query ต้อง order คงที่ (ใน SQL) -> range ต่อกันไม่ซ้ำ / ไม่หลุด
+    frames = []
+    start = 0
+    while True:
+        page = fetch_frame(
+            name,
+            lambda: make_query().range(start, start + PAGE_SIZE - 1),
+            cols,
+        )
+        frames.append(page)
+        if len(page) < PAGE_SIZE:
+            break
+        start += PAGE_SIZE
+
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True)
+
+
+# =====================================================
+# QUERIES
+# =====================================================
+def plan_rows(client, date_from, date_to):
+    return fetch_frame(
+        "v_plan_vs_actual",
+        lambda: (
+            client.table("v_plan_vs_actual")
+            .select(",".join(PLAN_COLS))
+            .gte("plan_delivery_dt", date_from.isoformat())
+            .lte("plan_delivery_dt", date_to.isoformat())
+        ),
+        PLAN_COLS,
+    )
+
+
+def plan_kpi(client, date_from, date_to, keyword=""):
+    # aggregate แถวเดียว (sql/rpc_plan_kpi.sql) -> JSON ธรรมดา
+    res = client.rpc(
+        "rpc_plan_kpi",
+        {
+            "p_date_from": date_from.isoformat(),
+            "p_date_to": date_to.isoformat(),
+            "p_keyword": (keyword or "").strip() or None
+        }
+    ).execute()
+
+    return res.data[0] if res.data else None
+
+
+def lot_circuits(client, lot_no):
+    # lot ใหญ่เกิน max-rows ได้ (KPI Total / Sent / Remaining นับจากผลนี้)
+    # rpc_lot_kanban_circuits ไม่มี order คงที่ -> range ต่อกันไม่ได้
+    # ใช้ rpc multi (order by lot_no, kanban_no) กับ lot เดียวแทน
+    return lot_circuits_multi(client, [lot_no])
+
+
+def lot_circuits_multi(client, lot_nos):
+    # 10-30 lot x หลายร้อยวงจร เกิน max-rows ได้ -> paged
+    return fetch_paged(
+        "rpc_lot_kanban_circuits_multi",
+        lambda: client.rpc(
+            "rpc_lot_kanban_circuits_multi",
+            {"p_lot_nos": list(lot_nos)}
+        ),
+        CIRCUIT_COLS,
+    )
+
+
+def part_tracking(client, lot_no=None, harness_part_no=None):
+    return fetch_frame(
+        "rpc_part_tracking_lot_harness",
+        lambda: client.rpc(
+            "rpc_part_tracking_lot_harness",
+            {
+                "p_lot_no": lot_no,
+                "p_harness_part_no": harness_part_no
+            }
+        ),
+        TRACKING_COLS,
+    )
@@ -0,0 +1,311 @@
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+
+# =====================================================
+# LOCAL READ REPLICA (lot_master + kanban_delivery)
+# -----------------------------------------------------
+# SQLite snapshot ที่ sync แบบ delta จาก Supabase
+#   lot_master      -> ตาม updated_at  (upsert by kanban_no)
+#   kanban_delivery -> ตาม delivered_at (append-only)
+# หน้า read-only ใช้ไฟล์นี้ join เองได้ ไม่ต้องยิง DB
+# =====================================================
+LOT_MASTER_COLS = [
+    "lot_no",
+    "kanban_no",
+    "model_name",
+    "harness_part_no",
+    "wire_number",
+    "wire_harness_code",
+    "subpackage_number",
+    "cable_name",
+    "wire_length_mm",
+    "joint_a",
+    "joint_b",
+    "mc_a",
+    "mc_b",
+    "twist_mc",
+    "updated_at",
+]
+
+DELIVERY_COLS = [
+    "kanban_no",
+    "delivered_at",
+]
+
+PAGE_SIZE = 1000
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS lot_master (
+    {", ".join(c + " TEXT" for c in LOT_MASTER_COLS if c != "kanban_no")},
+    kanban_no TEXT PRIMARY KEY
+);
+CREATE INDEX IF NOT EXISTS ix_lot_master_lot ON lot_master (lot_no);
+CREATE INDEX IF NOT EXISTS ix_lot_master_part ON lot_master (harness_part_no);
+
+CREATE TABLE IF NOT EXISTS kanban_delivery (
+    kanban_no TEXT PRIMARY KEY,
+    delivered_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    table_name TEXT PRIMARY KEY,
+    watermark TEXT,
+    synced_at REAL
+);
+"""
+
+_sync_lock = threading.Lock()
+_threads = {}
+_status = {}        # path -> สถานะ sync ล่าสุด (หน้า Admin)
+
+
+def connect(path):
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+# =====================================================
+# DELTA SYNC
+# =====================================================
+def _sync_table(client, conn, table, cols, ts_col, conflict):
+    row = conn.execute(
+        "SELECT watermark FROM sync_state WHERE table_name = ?", (table,)
+    ).fetchone()
+    watermark = row[0] if row else None
+    # filter ใช้ watermark ตอนเริ่ม sync ตลอดทุก page (range ต่อกันได้ไม่หลุดแถว)
+    # watermark ใหม่เก็บแยก -> บันทึกตอนจบ
+    since = watermark
+
+    placeholders = ", ".join("?" for _ in cols)
+    insert_sql = (
+        f"INSERT OR {conflict} INTO {table} ({', '.join(cols)}) "
+        f"VALUES ({placeholders})"
+    )
+
+    fetched = 0
+    start = 0
+    while True:
+        query = (
+            client.table(table)
+            .select(",".join(cols))
+            .order(ts_col, nullsfirst=True)
+            .order("kanban_no")
+        )
+        # gte (ไม่ใช่ gt) กันแถวที่ timestamp ชนกันหลุด -> upsert ซ้ำได้ไม่เสียหาย
+        if since:
+            query = query.gte(ts_col, since)
+
+        rows = query.range(start, start + PAGE_SIZE - 1).execute().data or []
+
+        conn.executemany(
+            insert_sql,
+            [
+                tuple(None if r.get(c) is None else str(r.get(c)) for c in cols)
+                for r in rows
+            ],
+        )
+
+        stamps = [str(r[ts_col]) for r in rows if r.get(ts_col)]
+        if stamps:
+            watermark = max([watermark or ""] + stamps)
+
+        fetched += len(rows)
+        if len(rows) < PAGE_SIZE:
+            break
+        start += PAGE_SIZE
+
+    conn.execute(
+        "INSERT OR REPLACE INTO sync_state (table_name, watermark, synced_at) "
+        "VALUES (?, ?, ?)",
+        (table, watermark, time.time()),
+    )
+    return fetched
+
+
+def sync(client, path):
+    with _sync_lock:
+        conn = connect(path)
+        try:
+            with conn:
+                lots = _sync_table(
+                    client, conn, "lot_master",
+                    LOT_MASTER_COLS, "updated_at", "REPLACE"
+                )
+                deliveries = _sync_table(
+                    client, conn, "kanban_delivery",
+                    DELIVERY_COLS, "delivered_at", "IGNORE"
+                )
+        finally:
+            conn.close()
+
+    return {"lot_master": lots, "kanban_delivery": deliveries}
+
+
+def status(path):
+    return dict(_status.get(path) or {})
+
+
+def _sync_loop(client, path, interval):
+    while True:
+        s = _status.setdefault(path, {
+            "last_ok": None, "last_error": None, "failures": 0, "fetched": None,
+        })
+        s["attempt_at"] = time.time()
+        try:
+            s["fetched"] = sync(client, path)
+            s.update(last_ok=time.time(), last_error=None, failures=0)
+        except Exception as e:
+            # network ล่ม -> ใช้ snapshot เดิมต่อ แล้วลองใหม่รอบหน้า
+            s.update(last_error=str(e), failures=s["failures"] + 1)
+        time.sleep(interval)
+
+
+def start_sync_thread(client, path, interval=60):
+    with _sync_lock:
+        if path in _threads and _threads[path].is_alive():
+            return _threads[path]
+
+        t = threading.Thread(
+            target=_sync_loop,
+            args=(client, path, interval),
+            name=f"replica-sync:{path}",
+            daemon=True,
+        )
+        t.start()
+        _threads[path] = t
+        return t
+
+
+def synced_at(path):
+    conn = connect(path)
+    try:
+        row = conn.execute(
+            "SELECT MIN(synced_at) FROM sync_state"
+        ).fetchone()
+        count = conn.execute("SELECT COUNT(*) FROM sync_state").fetchone()[0]
+    finally:
+        conn.close()
+
+    # ต้อง sync ครบทั้ง 2 ตารางอย่างน้อย 1 รอบก่อนถึงจะใช้ได้
+    if count < 2 or row[0] is None:
+        return None
+    return pd.Timestamp(row[0], unit="s", tz="UTC").tz_convert("Asia/Bangkok")
+
+
+def is_ready(path):
+    return synced_at(path) is not None
+
+
+# =====================================================
+# LOCAL QUERIES (แทน RPC)
+# =====================================================
+_JOINED = """
+SELECT m.*, d.delivered_at
+FROM lot_master m
+LEFT JOIN kanban_delivery d ON d.kanban_no = m.kanban_no
+"""
+
+
+def _where(lot_no=None, model=None, wire_number=None, part_no=None):
+    clauses, params = [], []
+    if lot_no:
+        clauses.append("m.lot_no = ?")
+        params.append(lot_no)
+    if model:
+        clauses.append("m.model_name LIKE ?")
+        params.append(f"%{model}%")
+    if wire_number:
+        clauses.append("m.wire_number LIKE ?")
+        params.append(f"%{wire_number}%")
+    if part_no:
+        clauses.append("m.harness_part_no LIKE ?")
+        params.append(f"%{part_no}%")
+
+    sql = " WHERE " + " AND ".join(clauses) if clauses else ""
+    return sql, params
+
+
+def _read(path, sql, params):
+    conn = connect(path)
+    try:
+        return pd.read_sql_query(sql, conn, params=params)
+    finally:
+        conn.close()
+
+
+def _gmt7(series):
+    return (
+        pd.to_datetime(series, utc=True, errors="coerce")
+          .dt.tz_convert("Asia/Bangkok")
+          .dt.strftime("%Y-%m-%d %H:%M:%S")
+    )
+
+
+def distinct_lots(path):
+    df = _read(
+        path,
+        "SELECT DISTINCT lot_no FROM lot_master "
+        "WHERE lot_no IS NOT NULL AND lot_no <> '' ORDER BY lot_no",
+        [],
+    )
+    return df["lot_no"].tolist()
+
+
+def lot_circuits(path, lot_no, model=None, status="ALL",
+                 wire_number=None, part_no=None):
+    where, params = _where(lot_no, model, wire_number, part_no)
+    if status == "SENT":
+        where += (" AND " if where else " WHERE ") + "d.kanban_no IS NOT NULL"
+    elif status == "REMAIN":
+        where += (" AND " if where else " WHERE ") + "d.kanban_no IS NULL"
+
+    df = _read(path, _JOINED + where + " ORDER BY m.kanban_no", params)
+    df["status"] = df["delivered_at"].notna().map(
+        {True: "SENT", False: "REMAIN"}
+    )
+    df["delivered_at_gmt7"] = _gmt7(df["delivered_at"])
+    return df
+
+
+def lot_circuits_multi(path, lot_nos):
+    marks = ", ".join("?" * len(lot_nos))
+    df = _read(
+        path,
+        _JOINED + f" WHERE m.lot_no IN ({marks}) ORDER BY m.lot_no, m.kanban_no",
+        list(lot_nos),
+    )
+    df["status"] = df["delivered_at"].notna().map(
+        {True: "SENT", False: "REMAIN"}
+    )
+    df["delivered_at_gmt7"] = _gmt7(df["delivered_at"])
+    return df
+
+
+def part_tracking(path, lot_no=None, harness_part_no=None):
+    clauses, params = [], []
+    if lot_no:
+        clauses.append("m.lot_no = ?")
+        params.append(lot_no)
+    if harness_part_no:
+        clauses.append("m.harness_part_no = ?")
+        params.append(harness_part_no)
+    where = " WHERE " + " AND ".join(clauses) if clauses else ""
+
+    df = _read(
+        path,
+        "SELECT m.lot_no, m.kanban_no, m.model_name, m.harness_part_no, "
+        "m.wire_number, d.delivered_at "
+        "FROM lot_master m "
+        "LEFT JOIN kanban_delivery d ON d.kanban_no = m.kanban_no" + where,
+        params,
+    )
+    df["sent"] = df["delivered_at"].notna()
+    # ให้ยังไม่ส่ง = None เหมือนผล RPC (to_gmt7 เช็ค falsy)
+    df["delivered_at"] = df["delivered_at"].astype(object).where(df["sent"], None)
+    return df
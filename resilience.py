@@ -0,0 +1,216 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import datacache
+
+
+# =====================================================
+# READ RESILIENCE (timeout + circuit breaker + stale-while-revalidate)
+# -----------------------------------------------------
+# ทุก read ของหน้า dashboard ผ่าน read()
+#   timeout      : รอไม่เกิน TIMEOUT_SEC ต่อ call (ไม่ค้างทั้ง session)
+#   breaker      : ช้า (> SLOW_SEC) / พัง ติดกัน TRIP_AFTER ครั้ง -> เปิด
+#                  ระหว่างเปิดไม่ยิง DB เลย, ครบ COOLDOWN_SEC ให้ลอง 1 call
+#   stale        : มีผลเก่าใน cache (หมดอายุ) -> คืนทันที + ป้าย "ข้อมูล ณ"
+#                  แล้วโหลดใหม่เบื้องหลัง (stale-while-revalidate)
+#                  ไม่มีผลเก่า / กด Refresh -> รอได้ไม่เกิน TIMEOUT_SEC
+#   single-flight: key เดียวกันมี call เดียว session อื่นรอ future เดิม (มี timeout)
+#                  ไม่ต่อคิวรอ lock ทีละคน
+# =====================================================
+TIMEOUT_SEC = 10.0
+SLOW_SEC = 5.0
+TRIP_AFTER = 3
+COOLDOWN_SEC = 30.0
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="read")
+_breakers = {}
+_inflight = {}      # key -> Future ของ call ที่กำลังโหลด key นั้น
+_lock = threading.Lock()
+
+
+class Unavailable(Exception):
+    pass
+
+
+def configure(timeout_sec=None, slow_sec=None, trip_after=None, cooldown_sec=None):
+    global TIMEOUT_SEC, SLOW_SEC, TRIP_AFTER, COOLDOWN_SEC
+    if timeout_sec:
+        TIMEOUT_SEC = float(timeout_sec)
+    if slow_sec:
+        SLOW_SEC = float(slow_sec)
+    if trip_after:
+        TRIP_AFTER = int(trip_after)
+    if cooldown_sec:
+        COOLDOWN_SEC = float(cooldown_sec)
+
+
+# =====================================================
+# CIRCUIT BREAKER (แยกตาม endpoint)
+# =====================================================
+def _breaker(name):
+    return _breakers.setdefault(name, {
+        "strikes": 0,
+        "opened_at": None,
+        "trial": False,
+        "last_ms": None,
+        "last_error": None,
+    })
+
+
+def _allow(name):
+    with _lock:
+        b = _breaker(name)
+        if b["opened_at"] is None:
+            return True
+        if time.time() - b["opened_at"] < COOLDOWN_SEC or b["trial"]:
+            return False
+        # half-open : ปล่อยให้ลอง 1 call
+        b["trial"] = True
+        return True
+
+
+def _record(name, ok, elapsed, error=None):
+    with _lock:
+        b = _breaker(name)
+        b["last_ms"] = round(elapsed * 1000)
+        if ok and elapsed < SLOW_SEC:
+            b.update(strikes=0, opened_at=None, trial=False, last_error=None)
+            return
+
+        b["strikes"] += 1
+        b["last_error"] = error or f"slow call {elapsed:.1f}s"
+        if b["trial"] or b["strikes"] >= TRIP_AFTER:
+            b.update(opened_at=time.time(), trial=False)
+
+
+def _late(key, future):
+    # call ที่ timeout ไปแล้วแต่เสร็จทีหลัง -> revalidate cache
+    def done(f):
+        if not f.cancelled() and f.exception() is None:
+            datacache.put(key, f.result())
+    future.add_done_callback(done)
+
+
+def call(name, fn, timeout=None, key=None):
+    if not _allow(name):
+        raise Unavailable(f"{name}: circuit open")
+
+    timeout = timeout or TIMEOUT_SEC
+    t0 = time.time()
+    future = _executor.submit(fn)
+    try:
+        result = future.result(timeout=timeout)
+    except FutureTimeout:
+        _record(name, False, time.time() - t0, "timeout")
+        if key is not None:
+            _late(key, future)
+        raise Unavailable(f"{name}: timeout after {timeout:g}s")
+    except Exception as e:
+        _record(name, False, time.time() - t0, str(e))
+        raise
+
+    _record(name, True, time.time() - t0)
+    return result
+
+
+# =====================================================
+# READ (cache -> stale + revalidate / รอ call)
+# =====================================================
+def _load(name, key, loader):
+    # รันใน executor : เก็บผลเข้า cache เองเมื่อเสร็จ (คนรอ timeout ไปแล้วก็ได้ผลรอบหน้า)
+    # จับเวลาตอนเริ่มจริง (เวลาต่อคิวใน executor ไม่นับเป็น call ช้า)
+    t0 = time.time()
+    try:
+        value = loader()
+    except Exception as e:
+        _record(name, False, time.time() - t0, str(e))
+        raise
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+
+    _record(name, True, time.time() - t0)
+    return value, datacache.put_entry(key, value)["at"]
+
+
+def revalidate(name, key, loader, executor=None):
+    # คืน future ของ call ที่โหลด key นี้ (มีอยู่แล้วใช้ตัวเดิม) / breaker เปิด -> Unavailable
+    # executor : งาน background (prefetch) ใช้ pool ของตัวเอง ไม่แย่งคิวหน้า dashboard
+    with _lock:
+        future = _inflight.get(key)
+        if future is not None:
+            return future
+
+    if not _allow(name):
+        raise Unavailable(f"{name}: circuit open")
+
+    with _lock:
+        future = _inflight.get(key)
+        if future is None:
+            future = (executor or _executor).submit(_load, name, key, loader)
+            # _load ลบออกจาก _inflight ตอนจบ (ต้องรอ _lock -> ลบหลังลงทะเบียนเสมอ)
+            _inflight[key] = future
+        return future
+
+
+def _stale(entry, error):
+    return {"value": entry["value"], "as_of": entry["at"], "stale": True, "error": error}
+
+
+def read(name, key, loader, ttl=None, fresh=False, timeout=None):
+    # คืน {"value", "as_of", "stale", "error"}
+    entry = datacache.entry(key)
+
+    hit = bool(entry) and not fresh and time.time() - entry["at"] < (ttl or datacache.TTL_SEC)
+    datacache.record(hit)
+    if hit:
+        return {"value": entry["value"], "as_of": entry["at"], "stale": False, "error": None}
+
+    # ผลเก่ามีอยู่ -> ไม่ให้ session รอ DB เลย
+    if entry and not fresh:
+        try:
+            revalidate(name, key, loader)
+            return _stale(entry, None)
+        except Unavailable as e:
+            return _stale(entry, str(e))
+
+    # ผลของ call บันทึกเข้า breaker ที่ _load ครั้งเดียว
+    # คนรอที่ timeout ไม่นับ strike (ไม่งั้น call ช้า 1 ครั้ง x จำนวนคนรอ = breaker เปิด)
+    timeout = timeout or TIMEOUT_SEC
+    try:
+        future = revalidate(name, key, loader)
+        value, at = future.result(timeout=timeout)
+    except FutureTimeout:
+        error = Unavailable(f"{name}: timeout after {timeout:g}s")
+        if not entry:
+            raise error
+        return _stale(entry, str(error))
+    except Exception as e:
+        if not entry:
+            raise
+        return _stale(entry, str(e))
+
+    # แต่ละ session ได้ view ของตัวเอง (future เดียวกันใช้ร่วมหลาย session)
+    return {"value": datacache.view(value), "as_of": at, "stale": False, "error": None}
+
+
+def status():
+    now = time.time()
+    with _lock:
+        out = []
+        for name, b in sorted(_breakers.items()):
+            if b["opened_at"] is None:
+                state = "closed"
+            elif b["trial"] or now - b["opened_at"] >= COOLDOWN_SEC:
+                state = "half-open"
+            else:
+                state = "open"
+            out.append({
+                "endpoint": name,
+                "state": state,
+                "strikes": b["strikes"],
+                "last_ms": b["last_ms"],
+                "last_error": b["last_error"],
+            })
+        return out
@@ -0,0 +1,307 @@
+import argparse
+import json
+import random
+import threading
+import time
+
+import scan_logic
+
+
+# =====================================================
+# SCAN LOAD TEST (หลายสถานีพร้อมกัน)
+# -----------------------------------------------------
+# ยิง process_scan (logic เดียวกับ confirm_scan / scan_server)
+# ใส่ backend จำลองในเครื่อง ไม่แตะ Supabase จริง
+#
+#   python scan_loadtest.py --stations 8 --scans 500 --latency-ms 20
+#
+# backend จำลองมี unique kanban_no เหมือน sql/kanban_delivery_unique.sql
+#   --no-unique : จำลอง DB ที่ยังไม่ติดตั้ง (เห็นชุดพ่วงถูก complete ซ้ำ)
+#
+# รายงาน: scans/sec, p50/p95/p99 ต่อ outcome,
+#         kanban ที่หาย (lost) / ถูก complete ซ้ำ (double)
+# =====================================================
+
+
+# =====================================================
+# STAND-IN BACKEND (หน้าตาเหมือน supabase client เท่าที่ scan ใช้)
+# =====================================================
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    def __init__(self, backend, table):
+        self.backend = backend
+        self.table = table
+        self.kanban = None
+
+    def select(self, *_):
+        return self
+
+    def eq(self, column, value):
+        self.kanban = value
+        return self
+
+    def limit(self, _):
+        return self
+
+    def execute(self):
+        self.backend.wait()
+        if self.table == "lot_master":
+            hit = self.kanban in self.backend.lot_master
+        else:
+            with self.backend.lock:
+                hit = self.kanban in self.backend.completions
+        return _Result([{"kanban_no": self.kanban}] if hit else [])
+
+
+class UniqueViolation(Exception):
+    code = "23505"
+
+
+class _Rpc:
+    def __init__(self, backend, params):
+        self.backend = backend
+        self.kanban = params["p_kanban_no"]
+
+    def execute(self):
+        # check -> insert ไม่ atomic (เหมือน RPC จริง)
+        # ไม่มี unique -> สองสถานีในชุดเดียวกันเห็นเป็น double-completed
+        # มี unique    -> call ที่มาทีหลังชน แล้ว rollback ทั้งชุด
+        b = self.backend
+        bundle = b.bundles.get(self.kanban, [self.kanban])
+
+        with b.lock:
+            pending = [k for k in bundle if k not in b.completions]
+
+        b.wait()
+
+        with b.lock:
+            if b.unique and any(k in b.completions for k in pending):
+                b.conflicts += 1
+                raise UniqueViolation(f"duplicate key kanban_no ({self.kanban})")
+            for k in pending:
+                b.completions[k] = b.completions.get(k, 0) + 1
+        return _Result([{"kanban_no": k} for k in pending])
+
+
+class StandInBackend:
+
+    def __init__(self, kanbans, bundles, latency_ms=0.0, jitter_ms=0.0, unique=True):
+        self.lot_master = set(kanbans)
+        self.bundles = bundles
+        self.completions = {}
+        self.unique = unique
+        self.conflicts = 0
+        self.lock = threading.Lock()
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+
+    def wait(self):
+        if self.latency or self.jitter:
+            time.sleep(max(0.0, random.gauss(self.latency, self.jitter)))
+
+    def table(self, name):
+        return _Query(self, name)
+
+    def rpc(self, name, params):
+        if name != "rpc_complete_kanban_bundle":
+            raise ValueError(f"stand-in backend has no RPC {name}")
+        return _Rpc(self, params)
+
+
+# =====================================================
+# SCAN STREAMS
+# =====================================================
+def build_dataset(n_kanbans, bundle_rate, bundle_size, rng):
+    kanbans = [f"LT{i:06d}" for i in range(n_kanbans)]
+    bundles = {}
+
+    i = 0
+    while i < n_kanbans:
+        if rng.random() < bundle_rate:
+            group = kanbans[i:i + bundle_size]
+            for k in group:
+                bundles[k] = group
+            i += bundle_size
+        else:
+            i += 1
+
+    return kanbans, bundles
+
+
+def build_streams(kanbans, stations, scans, dup_rate, unknown_rate,
+                  overlap_rate, rng):
+    # แบ่ง kanban ให้แต่ละสถานี; overlap = สแกน kanban ของสถานีอื่น (แย่งกัน)
+    own = [kanbans[s::stations] for s in range(stations)]
+    streams = []
+
+    for s in range(stations):
+        queue = list(own[s])
+        rng.shuffle(queue)
+        seen = []
+        stream = []
+
+        for n in range(scans):
+            r = rng.random()
+            if r < unknown_rate:
+                stream.append(f"UNKNOWN-{s}-{n}")
+            elif r < unknown_rate + dup_rate and seen:
+                stream.append(rng.choice(seen))
+            elif r < unknown_rate + dup_rate + overlap_rate and stations > 1:
+                other = rng.choice([o for o in range(stations) if o != s])
+                stream.append(rng.choice(own[other]))
+            elif queue:
+                k = queue.pop()
+                seen.append(k)
+                stream.append(k)
+            else:
+                stream.append(rng.choice(kanbans))
+
+        streams.append(stream)
+
+    return streams
+
+
+# =====================================================
+# RUN
+# =====================================================
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, round(pct / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def run(backend, streams, think_ms=0.0):
+    latencies = {}
+    lock = threading.Lock()
+    barrier = threading.Barrier(len(streams))
+
+    def station(stream):
+        local = []
+        barrier.wait()
+        for kanban in stream:
+            t0 = time.perf_counter()
+            try:
+                outcome = scan_logic.process_scan(backend, kanban)["outcome"]
+            except Exception:
+                outcome = "error"
+            local.append((outcome, (time.perf_counter() - t0) * 1000))
+            if think_ms:
+                time.sleep(think_ms / 1000)
+
+        with lock:
+            for outcome, ms in local:
+                latencies.setdefault(outcome, []).append(ms)
+
+    threads = [
+        threading.Thread(target=station, args=(s,), daemon=True)
+        for s in streams
+    ]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    return latencies, elapsed
+
+
+def report(backend, streams, latencies, elapsed):
+    total = sum(len(v) for v in latencies.values())
+
+    scanned_valid = {
+        k for s in streams for k in s if k in backend.lot_master
+    }
+    lost = sorted(k for k in scanned_valid if k not in backend.completions)
+    double = sorted(k for k, n in backend.completions.items() if n > 1)
+
+    return {
+        "stations": len(streams),
+        "scans": total,
+        "elapsed_sec": round(elapsed, 3),
+        "scans_per_sec": round(total / elapsed, 1) if elapsed else 0.0,
+        "outcomes": {
+            outcome: {
+                "count": len(ms),
+                "p50_ms": round(percentile(ms, 50), 2),
+                "p95_ms": round(percentile(ms, 95), 2),
+                "p99_ms": round(percentile(ms, 99), 2),
+            }
+            for outcome, ms in sorted(latencies.items())
+        },
+        "lost_kanbans": lost,
+        "double_completed_kanbans": double,
+        "unique_conflicts": backend.conflicts,
+    }
+
+
+def print_report(r):
+    print(
+        f"📦 {r['stations']} stations | {r['scans']} scans | "
+        f"{r['elapsed_sec']} s | {r['scans_per_sec']} scans/sec"
+    )
+    print(f"{'outcome':<10} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for outcome, s in r["outcomes"].items():
+        print(
+            f"{outcome:<10} {s['count']:>7} {s['p50_ms']:>9} "
+            f"{s['p95_ms']:>9} {s['p99_ms']:>9}"
+        )
+    print(f"❌ lost kanbans           : {len(r['lost_kanbans'])}")
+    print(f"⚠️ double-completed kanbans: {len(r['double_completed_kanbans'])}")
+    print(f"🛡️ unique conflicts (รายงานเป็นสแกนซ้ำ): {r['unique_conflicts']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-station scan load test")
+    parser.add_argument("--stations", type=int, default=4)
+    parser.add_argument("--scans", type=int, default=200,
+                        help="จำนวนสแกนต่อสถานี")
+    parser.add_argument("--kanbans", type=int, default=0,
+                        help="จำนวน kanban ใน lot master (default = stations * scans)")
+    parser.add_argument("--dup-rate", type=float, default=0.10)
+    parser.add_argument("--unknown-rate", type=float, default=0.05)
+    parser.add_argument("--overlap-rate", type=float, default=0.05,
+                        help="สัดส่วนที่สแกน kanban ของสถานีอื่น")
+    parser.add_argument("--bundle-rate", type=float, default=0.15)
+    parser.add_argument("--bundle-size", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=15.0,
+                        help="latency ต่อ call ของ backend จำลอง")
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--think-ms", type=float, default=0.0,
+                        help="เวลาพักระหว่างสแกนของแต่ละสถานี")
+    parser.add_argument("--no-unique", action="store_true",
+                        help="backend ไม่มี unique kanban_no (ก่อนติดตั้ง sql/kanban_delivery_unique.sql)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    kanbans, bundles = build_dataset(
+        args.kanbans or args.stations * args.scans,
+        args.bundle_rate, args.bundle_size, rng
+    )
+    streams = build_streams(
+        kanbans, args.stations, args.scans,
+        args.dup_rate, args.unknown_rate, args.overlap_rate, rng
+    )
+    backend = StandInBackend(
+        kanbans, bundles, args.latency_ms, args.jitter_ms, unique=not args.no_unique
+    )
+
+    latencies, elapsed = run(backend, streams, args.think_ms)
+    result = report(backend, streams, latencies, elapsed)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
+
+
+if __name__ == "__main__":
+    main()
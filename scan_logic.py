@@ -0,0 +1,181 @@
+import collections
+import threading
+import time
+
+
+# =====================================================
+# SCAN KANBAN : VALIDATE + COMMIT (ใช้ร่วมกัน Streamlit / scan_server)
+# =====================================================
+MSG_UNKNOWN = (
+    "❌ ไม่พบข้อมูล Kanban ใน Lot Master<br>"
+    "กรุณาติดต่อหัวหน้างานเพื่อแก้ไข"
+)
+MSG_DUPLICATE = (
+    "⚠️ Kanban นี้ถูกสแกนแล้ว<br>"
+    "📦 ไม่สามารถส่งซ้ำได้"
+)
+MSG_SINGLE = (
+    "✅ ส่ง Kanban สำเร็จ<br>"
+    "📦 Kanban เดี่ยว (ไม่มีพ่วง)"
+)
+
+# lot_master ไม่มีการลบ (upload = upsert) -> kanban ที่เจอแล้ว cache ได้ตลอด process
+_known_kanbans = set()
+
+# kanban_delivery ลบแถวได้ (หัวหน้าลบการส่งผิด / sql/kanban_delivery_unique.sql)
+# -> "ส่งแล้ว" จำไว้แค่ DELIVERED_TTL_SEC (สแกนซ้ำติดกันไม่ยิง DB)
+#    เกินนั้นถาม DB ใหม่ก่อนเรียก RPC เสมอ
+DELIVERED_TTL_SEC = 30
+_delivered_at = collections.OrderedDict()     # kanban -> เวลาที่รู้ว่าส่งแล้ว (เก่าสุดอยู่หน้า)
+
+# log การส่งใน process นี้ (หน้า summary ใช้เช็คว่าต้องโหลดใหม่ไหม)
+DELIVERY_LOG_MAX = 10000
+_delivery_log = collections.deque(maxlen=DELIVERY_LOG_MAX)
+_delivery_seq = 0
+_delivery_lock = threading.Lock()
+
+# lock แยกตาม kanban (striped) กันสองสถานีส่ง kanban เดียวกันพร้อมกัน
+# RPC complete ทั้งชุดพ่วง แต่ app ไม่รู้ว่าใบไหนอยู่ชุดเดียวกันจนกว่า RPC ตอบ
+# -> สองสถานีสแกนคนละใบในชุดเดียวกัน (หรือคนละ process) lock นี้กันไม่ได้
+#    กันที่ DB : unique kanban_no (sql/kanban_delivery_unique.sql)
+#    call ที่มาทีหลังชน unique ทั้ง transaction -> รายงานเป็นสแกนซ้ำ
+_locks = [threading.Lock() for _ in range(64)]
+
+UNIQUE_VIOLATION = "23505"
+
+
+def _result(kanban, outcome, color, text, bundle_count=0):
+    return {
+        "kanban_no": kanban,
+        "outcome": outcome,
+        "color": color,
+        "text": text,
+        "bundle_count": bundle_count,
+    }
+
+
+def _mark_delivered(kanbans):
+    # เรียกตอนถือ _delivery_lock
+    now = time.time()
+    for k in kanbans:
+        _delivered_at[k] = now
+        _delivered_at.move_to_end(k)
+    while _delivered_at and now - next(iter(_delivered_at.values())) >= DELIVERED_TTL_SEC:
+        _delivered_at.popitem(last=False)
+
+
+def _recently_delivered(kanban):
+    with _delivery_lock:
+        at = _delivered_at.get(kanban)
+    return at is not None and time.time() - at < DELIVERED_TTL_SEC
+
+
+def _record_delivery(kanbans):
+    global _delivery_seq
+
+    with _delivery_lock:
+        _mark_delivered(kanbans)
+        for k in kanbans:
+            _delivery_seq += 1
+            _delivery_log.append((_delivery_seq, k))
+
+
+def delivery_seq():
+    return _delivery_seq
+
+
+def preload(kanbans, delivered=()):
+    # warm-up ต้นกะ : kanban ที่มีใน lot_master ใส่ cache ล่วงหน้า
+    # ที่ส่งแล้วจำไว้แค่ DELIVERED_TTL_SEC เหมือนผลสแกน
+    _known_kanbans.update(kanbans)
+    with _delivery_lock:
+        _mark_delivered(delivered)
+
+
+def delivered_since(seq):
+    # None = log ตกหล่นเกินช่วงที่เก็บ -> ควรถือว่าเปลี่ยนแล้ว
+    with _delivery_lock:
+        if _delivery_log and _delivery_log[0][0] > seq + 1:
+            return None
+        return {k for s, k in _delivery_log if s > seq}
+
+
+def _exists(client, table, kanban):
+    return bool(
+        client.table(table)
+        .select("kanban_no")
+        .eq("kanban_no", kanban)
+        .limit(1)
+        .execute()
+        .data
+    )
+
+
+def process_scan(client, kanban):
+    kanban = str(kanban).strip() if kanban is not None else ""
+    if not kanban:
+        return None
+
+    with _locks[hash(kanban) % len(_locks)]:
+
+        # ------------------------------------------------
+        # STEP 0 : ตรวจว่า Kanban มีอยู่ใน lot_master ไหม
+        # ------------------------------------------------
+        if kanban not in _known_kanbans:
+            if not _exists(client, "lot_master", kanban):
+                return _result(kanban, "unknown", "orange", MSG_UNKNOWN)
+            _known_kanbans.add(kanban)
+
+        # ------------------------------------------------
+        # STEP 1 : เช็คว่าเคย Complete แล้วหรือยัง
+        # ------------------------------------------------
+        # 🟧 สแกนซ้ำ → หยุดทันที (ไม่เรียก RPC)
+        if _recently_delivered(kanban):
+            return _result(kanban, "duplicate", "orange", MSG_DUPLICATE)
+
+        if _exists(client, "kanban_delivery", kanban):
+            with _delivery_lock:
+                _mark_delivered([kanban])
+            return _result(kanban, "duplicate", "orange", MSG_DUPLICATE)
+
+        # ------------------------------------------------
+        # STEP 2 : เรียก RPC bundle (เฉพาะสแกนใหม่)
+        # ------------------------------------------------
+        try:
+            rpc_res = client.rpc(
+                "rpc_complete_kanban_bundle",
+                {"p_kanban_no": kanban}
+            ).execute()
+        except Exception as e:
+            # ชุดพ่วงนี้ถูก complete จากสถานีอื่นไปก่อน (ทั้งชุด rollback ไม่มีแถวซ้ำ)
+            if getattr(e, "code", None) != UNIQUE_VIOLATION:
+                raise
+            with _delivery_lock:
+                _mark_delivered([kanban])
+            return _result(kanban, "duplicate", "orange", MSG_DUPLICATE)
+
+        bundle = rpc_res.data or []
+        bundle_count = len(bundle)
+
+        _record_delivery(
+            [kanban] + [
+                str(r["kanban_no"]).strip()
+                for r in bundle
+                if isinstance(r, dict) and r.get("kanban_no")
+            ]
+        )
+
+    # ------------------------------------------------
+    # STEP 3 : MESSAGE + COLOR LOGIC
+    # ------------------------------------------------
+    if bundle_count > 1:
+        # 🟦 สแกนใหม่ + มีพ่วง
+        return _result(
+            kanban, "bundle", "blue",
+            f"✅ ส่ง Kanban สำเร็จ<br>"
+            f"🧩 ชุดพ่วง ถูก Complete พร้อมกัน {bundle_count} ใบ",
+            bundle_count
+        )
+
+    # 🟩 สแกนใหม่ + ไม่มีพ่วง
+    return _result(kanban, "single", "green", MSG_SINGLE, bundle_count)
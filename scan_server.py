@@ -0,0 +1,197 @@
+import argparse
+import collections
+import json
+import os
+import sys
+import threading
+import time
+import tomllib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from supabase import create_client
+
+from scan_logic import process_scan
+
+
+# =====================================================
+# HEADLESS SCAN SERVICE
+# -----------------------------------------------------
+# รับสแกนโดยไม่ผ่าน Streamlit rerun
+#   POST /scan            {"kanban_no": "...", "station": "ST1"}  (หรือ text ล้วน)
+#   GET  /recent?since=N  ผลสแกนล่าสุด (หน้า Streamlit ใช้แสดงผล)
+#   GET  /health
+# --stdin : อ่านจาก keyboard-wedge / serial scanner ที่ส่งบรรทัดเข้า terminal
+#
+#   python scan_server.py --port 8765 --stdin --station ST1
+# =====================================================
+RECENT_MAX = 500
+
+_recent = collections.deque(maxlen=RECENT_MAX)
+_recent_lock = threading.Lock()
+_seq = 0
+
+# seq เริ่ม 0 ใหม่ทุกครั้งที่ start -> หน้าจอแสดงผลใช้ BOOT_ID รู้ว่า server restart
+BOOT_ID = f"{int(time.time() * 1000):x}"
+
+
+def load_secrets():
+    url = os.environ.get("SUPABASE_URL")
+    key = os.environ.get("SUPABASE_KEY")
+    if url and key:
+        return url, key
+
+    path = os.path.join(os.path.dirname(__file__), ".streamlit", "secrets.toml")
+    with open(path, "rb") as f:
+        secrets = tomllib.load(f)
+    return secrets["SUPABASE_URL"], secrets["SUPABASE_KEY"]
+
+
+def ingest(client, kanban, station=""):
+    global _seq
+
+    t0 = time.perf_counter()
+    try:
+        result = process_scan(client, kanban)
+    except Exception as e:
+        result = {
+            "kanban_no": str(kanban).strip(),
+            "outcome": "error",
+            "color": "orange",
+            "text": f"❌ บันทึกไม่สำเร็จ: {e}",
+            "bundle_count": 0,
+        }
+    if result is None:
+        return None
+
+    result["station"] = station
+    result["elapsed_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+    result["scanned_at"] = time.time()
+
+    with _recent_lock:
+        _seq += 1
+        result["seq"] = _seq
+        result["boot"] = BOOT_ID
+        _recent.append(result)
+
+    return result
+
+
+def recent(since=0, station=None, boot=None):
+    with _recent_lock:
+        # seq ของ client มาจาก server รอบก่อน (restart แล้ว) -> ส่งตั้งแต่ต้น
+        if (boot and boot != BOOT_ID) or since > _seq:
+            since = 0
+        return [
+            r for r in _recent
+            if r["seq"] > since and (not station or r["station"] == station)
+        ]
+
+
+def make_handler(client):
+
+    class ScanHandler(BaseHTTPRequestHandler):
+
+        def _send(self, status, body):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            qs = parse_qs(url.query)
+
+            if url.path == "/health":
+                self._send(200, {"ok": True})
+            elif url.path == "/recent":
+                try:
+                    since = int(qs.get("since", ["0"])[0] or 0)
+                except ValueError:
+                    self._send(400, {"error": "invalid since"})
+                    return
+                station = qs.get("station", [None])[0]
+                boot = qs.get("boot", [None])[0]
+                self._send(200, recent(since, station, boot))
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            if urlparse(self.path).path != "/scan":
+                self._send(404, {"error": "not found"})
+                return
+
+            length = int(self.headers.get("Content-Length") or 0)
+
+            try:
+                raw = self.rfile.read(length).decode("utf-8")
+                if "json" in (self.headers.get("Content-Type") or ""):
+                    body = json.loads(raw or "{}")
+                    if not isinstance(body, dict):
+                        raise ValueError("body must be a JSON object")
+                    kanban = body.get("kanban_no", "")
+                    station = body.get("station", "")
+                else:
+                    kanban, station = raw, ""
+            except ValueError as e:
+                # JSON พัง / ไม่ใช่ UTF-8 -> 400 (ไม่ปล่อยให้ connection ค้างไม่มีคำตอบ)
+                self._send(400, {"error": f"invalid body: {e}"})
+                return
+
+            result = ingest(client, kanban, station)
+            if result is None:
+                self._send(400, {"error": "empty kanban_no"})
+            else:
+                self._send(200, result)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ScanHandler
+
+
+def read_stdin(client, station):
+    colors = {"green": "\033[42m", "blue": "\033[44m", "orange": "\033[43m"}
+    for line in sys.stdin:
+        result = ingest(client, line, station)
+        if result is None:
+            continue
+        text = result["text"].replace("<br>", " | ")
+        print(
+            f"{colors.get(result['color'], '')} {result['kanban_no']} \033[0m "
+            f"{text} ({result['elapsed_ms']} ms)",
+            flush=True
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Kanban scan service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--stdin", action="store_true",
+                        help="อ่านสแกนจาก stdin (keyboard-wedge / serial)")
+    parser.add_argument("--station", default="",
+                        help="ชื่อสถานีสำหรับสแกนที่มาจาก stdin")
+    args = parser.parse_args()
+
+    client = create_client(*load_secrets())
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(client))
+
+    if args.stdin:
+        threading.Thread(
+            target=read_stdin, args=(client, args.station), daemon=True
+        ).start()
+
+    print(f"📦 scan service on http://{args.host}:{args.port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+-- =====================================================
+-- DELIVERY RATE TIME SERIES (kanban ส่งแล้ว ต่อช่วงเวลา)
+-- -----------------------------------------------------
+-- delivery_rate : grain (minute | hour | shift) + bucket + lot + harness part
+--                 -> จำนวน kanban ที่ส่ง (นับครั้งแรกที่ส่งเท่านั้น)
+-- shift = กะ 08:00-20:00 / 20:00-08:00 (Asia/Bangkok), bucket = เวลาเริ่มกะ
+--
+-- อัปเดตทีละแถวด้วย trigger บน kanban_delivery (ไม่คำนวณใหม่ทั้งก้อน)
+-- หน้า Delivery Rate อ่านผ่าน rpc_delivery_rate (downsample ตามจำนวนจุดของกราฟ)
+--
+-- ติดตั้งครั้งแรก / ซ่อมข้อมูล : select public.rebuild_delivery_rate();
+-- ลบ bucket ระดับนาทีที่เก่ากว่า N วัน : select public.prune_delivery_rate(14);
+-- =====================================================
+create table if not exists public.delivery_rate (
+    grain           text        not null,   -- minute | hour | shift
+    bucket          timestamptz not null,
+    lot_no          text        not null,
+    harness_part_no text        not null,
+    kanbans         integer     not null default 0,
+    primary key (grain, bucket, lot_no, harness_part_no)
+);
+
+create index if not exists ix_delivery_rate_lot
+    on public.delivery_rate (grain, lot_no, bucket);
+
+
+-- -----------------------------------------------------
+-- เวลาเริ่มกะ (08:00 / 20:00 เวลาไทย) ของ timestamp
+-- -----------------------------------------------------
+create or replace function public.dr_shift_start(p_ts timestamptz)
+returns timestamptz
+language sql
+immutable
+as $$
+    select (
+        date_trunc('day', (p_ts at time zone 'Asia/Bangkok') - interval '8 hours')
+        + interval '8 hours'
+        + case
+            when extract(hour from (p_ts at time zone 'Asia/Bangkok') - interval '8 hours') >= 12
+                then interval '12 hours'
+            else interval '0 hours'
+          end
+    ) at time zone 'Asia/Bangkok';
+$$;
+
+
+-- -----------------------------------------------------
+-- บวก / ลบ 1 kanban เข้าทุก grain
+-- -----------------------------------------------------
+create or replace function public.dr_apply(
+    p_ts      timestamptz,
+    p_lot_no  text,
+    p_part_no text,
+    p_sign    integer
+)
+returns void
+language sql
+as $$
+    insert into public.delivery_rate as r (
+        grain, bucket, lot_no, harness_part_no, kanbans
+    )
+    values
+        ('minute', date_trunc('minute', p_ts), coalesce(p_lot_no, ''), coalesce(p_part_no, ''), p_sign),
+        ('hour',   date_trunc('hour', p_ts),   coalesce(p_lot_no, ''), coalesce(p_part_no, ''), p_sign),
+        ('shift',  public.dr_shift_start(p_ts), coalesce(p_lot_no, ''), coalesce(p_part_no, ''), p_sign)
+    on conflict (grain, bucket, lot_no, harness_part_no) do update set
+        kanbans = r.kanbans + excluded.kanbans;
+$$;
+
+
+-- -----------------------------------------------------
+-- TRIGGER : kanban_delivery (scan / RPC bundle)
+-- -----------------------------------------------------
+create or replace function public.trg_dr_kanban_delivery()
+returns trigger
+language plpgsql
+as $$
+declare
+    d       record;
+    m       record;
+    v_sign  integer;
+    v_count integer;
+begin
+    if tg_op = 'INSERT' then
+        d := new;
+        v_sign := 1;
+    else
+        d := old;
+        v_sign := -1;
+    end if;
+
+    -- นับเฉพาะการส่งครั้งแรก / การลบแถวสุดท้ายของ kanban นั้น
+    select count(*) into v_count
+    from public.kanban_delivery x
+    where x.kanban_no = d.kanban_no;
+
+    if (tg_op = 'INSERT' and v_count > 1)
+    or (tg_op = 'DELETE' and v_count > 0) then
+        return null;
+    end if;
+
+    select lm.lot_no, lm.harness_part_no into m
+    from public.lot_master lm
+    where lm.kanban_no = d.kanban_no;
+
+    if not found then
+        return null;
+    end if;
+
+    perform public.dr_apply(
+        coalesce(d.delivered_at, now()), m.lot_no, m.harness_part_no, v_sign
+    );
+
+    return null;
+end;
+$$;
+
+drop trigger if exists dr_kanban_delivery on public.kanban_delivery;
+create trigger dr_kanban_delivery
+    after insert or delete
+    on public.kanban_delivery
+    for each row execute function public.trg_dr_kanban_delivery();
+
+
+-- -----------------------------------------------------
+-- RPC : อ่าน time series แบบ downsample
+-- -----------------------------------------------------
+-- แต่ละจุดกว้าง >= (p_to - p_from) / p_points -> รวม bucket ติดกันเป็นช่วงละ n * grain
+-- p_grain = null -> grain ละเอียดสุดที่ยังต้องรวม < 1 bucket ของ grain ถัดไป
+--   เช่น 30 วัน / 300 จุด = 2.4 ชม. ต่อจุด -> hour x 3 = 240 จุด
+--        6 ชม. / 300 จุด = 72 วินาที  -> minute x 2 = 180 จุด
+--        1 ปี  / 300 จุด = 29 ชม.     -> shift x 3
+-- -----------------------------------------------------
+create or replace function public.rpc_delivery_rate(
+    p_from            timestamptz,
+    p_to              timestamptz,
+    p_lot_no          text    default null,
+    p_harness_part_no text    default null,
+    p_grain           text    default null,
+    p_points          integer default 300
+)
+returns table (
+    bucket     timestamptz,
+    kanbans    bigint,
+    grain      text,
+    bucket_sec integer
+)
+language sql
+stable
+as $$
+    with span as (
+        select greatest(extract(epoch from p_to - p_from), 1) as sec,
+               greatest(coalesce(p_points, 300), 1)           as points
+    ),
+    g as (
+        select
+            coalesce(
+                p_grain,
+                case
+                    when s.sec / s.points < 3600  then 'minute'
+                    when s.sec / s.points < 43200 then 'hour'
+                    else 'shift'
+                end
+            ) as grain,
+            s.sec,
+            s.points
+        from span s
+    ),
+    w as (
+        select
+            g.grain,
+            (case g.grain when 'minute' then 60 when 'hour' then 3600 else 43200 end)
+            * greatest(
+                ceil(
+                    g.sec / g.points
+                    / (case g.grain when 'minute' then 60 when 'hour' then 3600 else 43200 end)
+                )::integer,
+                1
+            ) as width
+        from g
+    ),
+    origin as (
+        -- จุดเริ่มของช่องแรก ตรงกับ bucket ของ grain (กะเริ่ม 08:00 / 20:00)
+        select
+            case w.grain
+                when 'minute' then date_trunc('minute', p_from)
+                when 'hour'   then date_trunc('hour', p_from)
+                else public.dr_shift_start(p_from)
+            end as t0
+        from w
+    )
+    select
+        o.t0 + make_interval(
+            secs => floor(extract(epoch from r.bucket - o.t0) / w.width) * w.width
+        ) as bucket,
+        sum(r.kanbans)::bigint,
+        w.grain,
+        w.width::integer
+    from public.delivery_rate r
+    cross join w
+    cross join origin o
+    where r.grain = w.grain
+      and r.bucket >= o.t0
+      and r.bucket <  p_to
+      and (p_lot_no is null or r.lot_no = p_lot_no)
+      and (p_harness_part_no is null or r.harness_part_no = p_harness_part_no)
+    group by 1, w.grain, w.width
+    having sum(r.kanbans) <> 0
+    order by 1;
+$$;
+
+
+-- -----------------------------------------------------
+-- REBUILD (backfill ครั้งแรก / ซ่อมเมื่อข้อมูลเพี้ยน)
+-- -----------------------------------------------------
+create or replace function public.rebuild_delivery_rate()
+returns void
+language sql
+as $$
+    truncate public.delivery_rate;
+
+    insert into public.delivery_rate (grain, bucket, lot_no, harness_part_no, kanbans)
+    select g.grain, g.bucket, f.lot_no, f.harness_part_no, count(*)
+    from (
+        select
+            coalesce(lm.lot_no, '')          as lot_no,
+            coalesce(lm.harness_part_no, '') as harness_part_no,
+            min(d.delivered_at)              as delivered_at
+        from public.kanban_delivery d
+        join public.lot_master lm on lm.kanban_no = d.kanban_no
+        where d.delivered_at is not null
+        group by lm.kanban_no, lm.lot_no, lm.harness_part_no
+    ) f
+    cross join lateral (values
+        ('minute', date_trunc('minute', f.delivered_at)),
+        ('hour',   date_trunc('hour', f.delivered_at)),
+        ('shift',  public.dr_shift_start(f.delivered_at))
+    ) as g(grain, bucket)
+    group by g.grain, g.bucket, f.lot_no, f.harness_part_no;
+$$;
+
+
+-- -----------------------------------------------------
+-- PRUNE : bucket ระดับนาทีใช้ดูช่วงสั้น ๆ เท่านั้น
+-- -----------------------------------------------------
+create or replace function public.prune_delivery_rate(p_keep_days integer default 14)
+returns integer
+language sql
+as $$
+    with gone as (
+        delete from public.delivery_rate
+        where grain = 'minute'
+          and bucket < now() - make_interval(days => p_keep_days)
+        returning 1
+    )
+    select count(*)::integer from gone;
+$$;
+
+grant select on public.delivery_rate to anon, authenticated;
+grant execute on function public.rpc_delivery_rate(timestamptz, timestamptz, text, text, text, integer)
+    to anon, authenticated;
@@ -0,0 +1,22 @@
+-- =====================================================
+-- kanban_delivery : 1 kanban ส่งได้ครั้งเดียว (unique kanban_no)
+-- -----------------------------------------------------
+-- rpc_complete_kanban_bundle complete ทั้งชุดพ่วงใน transaction เดียว
+-- สองสถานีสแกนคนละใบในชุดเดียวกันพร้อมกัน (หรือ scan_server + Streamlit)
+-- -> lock ฝั่ง app กันไม่ได้ ทั้งสอง call เห็นว่ายังไม่ส่งแล้ว insert ซ้ำ
+-- unique นี้ทำให้ call ที่มาทีหลัง error 23505 ทั้งชุด (rollback)
+-- scan_logic.process_scan รายงานเป็น "สแกนซ้ำ"
+--
+-- ติดตั้ง: ลบแถวซ้ำเดิม (เก็บแถวที่ส่งก่อนสุด) แล้วสร้าง unique index
+-- หลังติดตั้งให้ rebuild rollup ที่นับจาก kanban_delivery:
+--   select public.rebuild_machine_workload();
+--   select public.rebuild_delivery_rate();
+-- =====================================================
+delete from public.kanban_delivery d
+using public.kanban_delivery k
+where d.kanban_no = k.kanban_no
+  and (coalesce(d.delivered_at, 'infinity'), d.ctid)
+    > (coalesce(k.delivered_at, 'infinity'), k.ctid);
+
+create unique index if not exists ux_kanban_delivery_kanban_no
+    on public.kanban_delivery (kanban_no);
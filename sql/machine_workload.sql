@@ -0,0 +1,325 @@
+-- =====================================================
+-- MACHINE WORKLOAD ROLLUPS (mc_a / mc_b / twist_mc)
+-- -----------------------------------------------------
+-- machine_workload       : ต่อ lot + เครื่อง  -> remaining / sent (วงจร + wire_length_mm)
+-- machine_workload_daily : ต่อวันส่ง (GMT+7) + lot + เครื่อง -> sent
+--
+-- อัปเดตทีละแถวด้วย trigger (ไม่คำนวณใหม่ทั้งก้อน)
+--   lot_master      insert / update / delete  (Upload Lot Master)
+--   kanban_delivery insert / delete           (Scan Kanban / RPC bundle)
+--
+-- ติดตั้งครั้งแรก / ซ่อมข้อมูล: select public.rebuild_machine_workload();
+-- =====================================================
+create table if not exists public.machine_workload (
+    lot_no              text    not null,
+    machine_role        text    not null,   -- mc_a | mc_b | twist_mc
+    machine             text    not null,
+    remaining_circuits  integer not null default 0,
+    sent_circuits       integer not null default 0,
+    remaining_length_mm numeric not null default 0,
+    sent_length_mm      numeric not null default 0,
+    updated_at          timestamptz not null default now(),
+    primary key (lot_no, machine_role, machine)
+);
+
+create index if not exists ix_machine_workload_active
+    on public.machine_workload (machine_role, machine)
+    where remaining_circuits > 0;
+
+create table if not exists public.machine_workload_daily (
+    work_date      date    not null,
+    lot_no         text    not null,
+    machine_role   text    not null,
+    machine        text    not null,
+    sent_circuits  integer not null default 0,
+    sent_length_mm numeric not null default 0,
+    primary key (work_date, lot_no, machine_role, machine)
+);
+
+
+-- -----------------------------------------------------
+-- wire_length_mm อาจเป็น text จากไฟล์ upload -> แปลงแบบไม่ error
+-- -----------------------------------------------------
+create or replace function public.mw_length(p_value text)
+returns numeric
+language sql
+immutable
+as $$
+    select case
+        when trim(coalesce(p_value, '')) ~ '^-?[0-9]+(\.[0-9]+)?$'
+            then trim(p_value)::numeric
+        else 0
+    end;
+$$;
+
+
+-- -----------------------------------------------------
+-- บวก / ลบ 1 วงจรเข้า rollup ของทุกเครื่องที่วงจรนี้ใช้
+-- -----------------------------------------------------
+create or replace function public.mw_apply(
+    p_lot_no  text,
+    p_mc_a    text,
+    p_mc_b    text,
+    p_twist   text,
+    p_length  numeric,
+    p_sent    boolean,
+    p_sign    integer
+)
+returns void
+language plpgsql
+as $$
+declare
+    r record;
+begin
+    for r in
+        select v.role, trim(v.machine) as machine
+        from (values
+            ('mc_a', p_mc_a),
+            ('mc_b', p_mc_b),
+            ('twist_mc', p_twist)
+        ) as v(role, machine)
+        where coalesce(trim(v.machine), '') <> ''
+    loop
+        insert into public.machine_workload as w (
+            lot_no, machine_role, machine,
+            remaining_circuits, sent_circuits,
+            remaining_length_mm, sent_length_mm
+        )
+        values (
+            coalesce(p_lot_no, ''), r.role, r.machine,
+            case when p_sent then 0 else p_sign end,
+            case when p_sent then p_sign else 0 end,
+            case when p_sent then 0 else p_sign * p_length end,
+            case when p_sent then p_sign * p_length else 0 end
+        )
+        on conflict (lot_no, machine_role, machine) do update set
+            remaining_circuits  = w.remaining_circuits  + excluded.remaining_circuits,
+            sent_circuits       = w.sent_circuits       + excluded.sent_circuits,
+            remaining_length_mm = w.remaining_length_mm + excluded.remaining_length_mm,
+            sent_length_mm      = w.sent_length_mm      + excluded.sent_length_mm,
+            updated_at          = now();
+    end loop;
+end;
+$$;
+
+
+create or replace function public.mw_apply_daily(
+    p_work_date date,
+    p_lot_no    text,
+    p_mc_a      text,
+    p_mc_b      text,
+    p_twist     text,
+    p_length    numeric,
+    p_sign      integer
+)
+returns void
+language plpgsql
+as $$
+declare
+    r record;
+begin
+    for r in
+        select v.role, trim(v.machine) as machine
+        from (values
+            ('mc_a', p_mc_a),
+            ('mc_b', p_mc_b),
+            ('twist_mc', p_twist)
+        ) as v(role, machine)
+        where coalesce(trim(v.machine), '') <> ''
+    loop
+        insert into public.machine_workload_daily as d (
+            work_date, lot_no, machine_role, machine,
+            sent_circuits, sent_length_mm
+        )
+        values (
+            p_work_date, coalesce(p_lot_no, ''), r.role, r.machine,
+            p_sign, p_sign * p_length
+        )
+        on conflict (work_date, lot_no, machine_role, machine) do update set
+            sent_circuits  = d.sent_circuits  + excluded.sent_circuits,
+            sent_length_mm = d.sent_length_mm + excluded.sent_length_mm;
+    end loop;
+end;
+$$;
+
+
+-- -----------------------------------------------------
+-- TRIGGER : lot_master (upload = upsert)
+-- -----------------------------------------------------
+create or replace function public.trg_mw_lot_master()
+returns trigger
+language plpgsql
+as $$
+declare
+    v_sent boolean;
+begin
+    if tg_op in ('UPDATE', 'DELETE') then
+        v_sent := exists (
+            select 1 from public.kanban_delivery d
+            where d.kanban_no = old.kanban_no
+        );
+        perform public.mw_apply(
+            old.lot_no, old.mc_a, old.mc_b, old.twist_mc,
+            public.mw_length(old.wire_length_mm::text), v_sent, -1
+        );
+    end if;
+
+    if tg_op in ('INSERT', 'UPDATE') then
+        v_sent := exists (
+            select 1 from public.kanban_delivery d
+            where d.kanban_no = new.kanban_no
+        );
+        perform public.mw_apply(
+            new.lot_no, new.mc_a, new.mc_b, new.twist_mc,
+            public.mw_length(new.wire_length_mm::text), v_sent, 1
+        );
+    end if;
+
+    return null;
+end;
+$$;
+
+drop trigger if exists mw_lot_master on public.lot_master;
+create trigger mw_lot_master
+    after insert or delete
+    on public.lot_master
+    for each row execute function public.trg_mw_lot_master();
+
+-- upload upsert ทุกคอลัมน์ทุกครั้ง -> ทำงานเฉพาะเมื่อค่าที่เกี่ยวข้องเปลี่ยนจริง
+drop trigger if exists mw_lot_master_update on public.lot_master;
+create trigger mw_lot_master_update
+    after update
+    on public.lot_master
+    for each row
+    when (
+        old.lot_no is distinct from new.lot_no
+        or old.mc_a is distinct from new.mc_a
+        or old.mc_b is distinct from new.mc_b
+        or old.twist_mc is distinct from new.twist_mc
+        or old.wire_length_mm is distinct from new.wire_length_mm
+    )
+    execute function public.trg_mw_lot_master();
+
+
+-- -----------------------------------------------------
+-- TRIGGER : kanban_delivery (scan -> remaining ย้ายไป sent)
+-- -----------------------------------------------------
+create or replace function public.trg_mw_kanban_delivery()
+returns trigger
+language plpgsql
+as $$
+declare
+    d       record;
+    m       record;
+    v_sign  integer;
+    v_count integer;
+begin
+    if tg_op = 'INSERT' then
+        d := new;
+        v_sign := 1;
+    else
+        d := old;
+        v_sign := -1;
+    end if;
+
+    -- นับเฉพาะการส่งครั้งแรก / การลบแถวสุดท้ายของ kanban นั้น
+    select count(*) into v_count
+    from public.kanban_delivery x
+    where x.kanban_no = d.kanban_no;
+
+    if (tg_op = 'INSERT' and v_count > 1)
+    or (tg_op = 'DELETE' and v_count > 0) then
+        return null;
+    end if;
+
+    select * into m
+    from public.lot_master lm
+    where lm.kanban_no = d.kanban_no;
+
+    if not found then
+        return null;
+    end if;
+
+    perform public.mw_apply(
+        m.lot_no, m.mc_a, m.mc_b, m.twist_mc,
+        public.mw_length(m.wire_length_mm::text), false, -v_sign
+    );
+    perform public.mw_apply(
+        m.lot_no, m.mc_a, m.mc_b, m.twist_mc,
+        public.mw_length(m.wire_length_mm::text), true, v_sign
+    );
+    perform public.mw_apply_daily(
+        (coalesce(d.delivered_at, now()) at time zone 'Asia/Bangkok')::date,
+        m.lot_no, m.mc_a, m.mc_b, m.twist_mc,
+        public.mw_length(m.wire_length_mm::text), v_sign
+    );
+
+    return null;
+end;
+$$;
+
+drop trigger if exists mw_kanban_delivery on public.kanban_delivery;
+create trigger mw_kanban_delivery
+    after insert or delete
+    on public.kanban_delivery
+    for each row execute function public.trg_mw_kanban_delivery();
+
+
+-- -----------------------------------------------------
+-- REBUILD (backfill ครั้งแรก / ซ่อมเมื่อข้อมูลเพี้ยน)
+-- -----------------------------------------------------
+create or replace view public.v_machine_circuits as
+select
+    coalesce(lm.lot_no, '') as lot_no,
+    v.role                  as machine_role,
+    trim(v.machine)         as machine,
+    public.mw_length(lm.wire_length_mm::text) as length_mm,
+    d.delivered_at
+from public.lot_master lm
+cross join lateral (values
+    ('mc_a', lm.mc_a),
+    ('mc_b', lm.mc_b),
+    ('twist_mc', lm.twist_mc)
+) as v(role, machine)
+left join lateral (
+    select min(x.delivered_at) as delivered_at
+    from public.kanban_delivery x
+    where x.kanban_no = lm.kanban_no
+) d on true
+where coalesce(trim(v.machine), '') <> '';
+
+create or replace function public.rebuild_machine_workload()
+returns void
+language sql
+as $$
+    truncate public.machine_workload, public.machine_workload_daily;
+
+    insert into public.machine_workload (
+        lot_no, machine_role, machine,
+        remaining_circuits, sent_circuits,
+        remaining_length_mm, sent_length_mm
+    )
+    select
+        lot_no, machine_role, machine,
+        count(*) filter (where delivered_at is null),
+        count(*) filter (where delivered_at is not null),
+        coalesce(sum(length_mm) filter (where delivered_at is null), 0),
+        coalesce(sum(length_mm) filter (where delivered_at is not null), 0)
+    from public.v_machine_circuits
+    group by lot_no, machine_role, machine;
+
+    insert into public.machine_workload_daily (
+        work_date, lot_no, machine_role, machine,
+        sent_circuits, sent_length_mm
+    )
+    select
+        (delivered_at at time zone 'Asia/Bangkok')::date,
+        lot_no, machine_role, machine,
+        count(*),
+        coalesce(sum(length_mm), 0)
+    from public.v_machine_circuits
+    where delivered_at is not null
+    group by 1, lot_no, machine_role, machine;
+$$;
+
+grant select on public.machine_workload, public.machine_workload_daily to anon, authenticated;
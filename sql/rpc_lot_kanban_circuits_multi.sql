@@ -0,0 +1,62 @@
+-- =====================================================
+-- rpc_lot_kanban_circuits_multi : วงจรของหลาย lot ใน call เดียว
+-- -----------------------------------------------------
+-- ใช้กับหน้า Lot Kanban Summary (lot เดียว / หลาย lot), drill-down หน้า Delivery Plan, warm-up
+-- ต้องติดตั้ง : lot เดียวก็อ่านผ่าน function นี้ (rpc_lot_kanban_circuits ไม่มี order -> page ไม่ได้)
+-- คอลัมน์เหมือน rpc_lot_kanban_circuits (p_status = 'ALL')
+-- KPI ต่อ lot คำนวณในเครื่องจากผลนี้ -> ไม่ต้องเรียก rpc_part_kpi แยก
+-- ผลเกิน max-rows ได้ -> client ขอทีละช่วงด้วย range (queries.fetch_paged)
+--   order by lot_no, kanban_no (unique) ต้องคงไว้ ให้แต่ละช่วงต่อกันพอดี
+-- =====================================================
+create or replace function public.rpc_lot_kanban_circuits_multi(
+    p_lot_nos text[]
+)
+returns table (
+    lot_no            text,
+    kanban_no         text,
+    model_name        text,
+    harness_part_no   text,
+    wire_number       text,
+    wire_harness_code text,
+    subpackage_number text,
+    cable_name        text,
+    wire_length_mm    text,
+    joint_a           text,
+    joint_b           text,
+    mc_a              text,
+    mc_b              text,
+    twist_mc          text,
+    status            text,
+    delivered_at_gmt7 text
+)
+language sql
+stable
+as $$
+    select
+        lm.lot_no::text,
+        lm.kanban_no::text,
+        lm.model_name::text,
+        lm.harness_part_no::text,
+        lm.wire_number::text,
+        lm.wire_harness_code::text,
+        lm.subpackage_number::text,
+        lm.cable_name::text,
+        lm.wire_length_mm::text,
+        lm.joint_a::text,
+        lm.joint_b::text,
+        lm.mc_a::text,
+        lm.mc_b::text,
+        lm.twist_mc::text,
+        case when d.delivered_at is null then 'REMAIN' else 'SENT' end,
+        to_char(d.delivered_at at time zone 'Asia/Bangkok', 'YYYY-MM-DD HH24:MI:SS')
+    from public.lot_master lm
+    left join lateral (
+        select min(x.delivered_at) as delivered_at
+        from public.kanban_delivery x
+        where x.kanban_no = lm.kanban_no
+    ) d on true
+    where lm.lot_no = any (p_lot_nos)
+    order by lm.lot_no, lm.kanban_no;
+$$;
+
+grant execute on function public.rpc_lot_kanban_circuits_multi(text[]) to anon, authenticated;
@@ -0,0 +1,49 @@
+-- =====================================================
+-- rpc_plan_kpi : KPI ของหน้า Delivery Plan (aggregate อย่างเดียว)
+-- -----------------------------------------------------
+-- เงื่อนไขเดียวกับ filter ฝั่ง client ใน views/delivery_plan.py
+--   plan_delivery_dt ระหว่าง p_date_from .. p_date_to
+--   keyword (lot / part / model) แบบ contains ไม่สนตัวพิมพ์
+-- สถานะ: DELIVERED actual >= plan | PARTIAL actual > 0 | PENDING
+-- =====================================================
+create or replace function public.rpc_plan_kpi(
+    p_date_from date,
+    p_date_to   date,
+    p_keyword   text default null
+)
+returns table (
+    plan_qty        numeric,
+    actual_qty      numeric,
+    pending_count   bigint,
+    partial_count   bigint,
+    delivered_count bigint,
+    row_count       bigint
+)
+language sql
+stable
+as $$
+    with f as (
+        select
+            coalesce(v.plan_qty, 0)   as plan_qty,
+            coalesce(v.actual_qty, 0) as actual_qty
+        from public.v_plan_vs_actual v
+        where v.plan_delivery_dt >= p_date_from
+          and v.plan_delivery_dt <= p_date_to
+          and (
+                coalesce(trim(p_keyword), '') = ''
+             or v.lot_no::text      ilike '%' || trim(p_keyword) || '%'
+             or v.part_number::text ilike '%' || trim(p_keyword) || '%'
+             or v.model_level::text ilike '%' || trim(p_keyword) || '%'
+          )
+    )
+    select
+        coalesce(sum(f.plan_qty), 0),
+        coalesce(sum(f.actual_qty), 0),
+        count(*) filter (where f.actual_qty < f.plan_qty and f.actual_qty <= 0),
+        count(*) filter (where f.actual_qty < f.plan_qty and f.actual_qty > 0),
+        count(*) filter (where f.actual_qty >= f.plan_qty),
+        count(*)
+    from f;
+$$;
+
+grant execute on function public.rpc_plan_kpi(date, date, text) to anon, authenticated;
@@ -0,0 +1,17 @@
+-- =====================================================
+-- v_lot_no : lot_no ไม่ซ้ำใน lot_master (ใช้สร้าง lot key index)
+-- -----------------------------------------------------
+-- lot_master 1 แถว = 1 kanban -> ให้ DB distinct ก่อน
+-- หน้า Lot Kanban Summary ไม่ต้อง page ผ่านทุก kanban เพื่อเก็บเลข lot
+-- lot_index.fetch_lots อ่าน view นี้ (ยังไม่ติดตั้ง -> อ่าน lot_master แบบเดิม)
+-- =====================================================
+create index if not exists ix_lot_master_lot_no
+    on public.lot_master (lot_no);
+
+create or replace view public.v_lot_no as
+select distinct lm.lot_no::text as lot_no
+from public.lot_master lm
+where lm.lot_no is not null
+  and lm.lot_no <> '';
+
+grant select on public.v_lot_no to anon, authenticated;
@@ -0,0 +1,17 @@
+import datacache
+
+
+def test_evicts_least_recently_used_over_budget(monkeypatch):
+    datacache.invalidate()
+    monkeypatch.setattr(datacache, "MAX_BYTES", 3500)
+
+    for i in range(3):
+        datacache.put(("k", i), "x" * 1000)
+    datacache.entry(("k", 0))                 # ใช้ล่าสุด -> ไม่ถูกทิ้ง
+    datacache.put(("k", 3), "x" * 1000)
+
+    assert datacache.keys() == [("k", 2), ("k", 0), ("k", 3)]
+    assert datacache.stats()["bytes"] <= datacache.MAX_BYTES
+
+    datacache.invalidate()
+    assert datacache.stats()["bytes"] == 0
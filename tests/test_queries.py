@@ -0,0 +1,83 @@
+import queries
+
+
+# =====================================================
+# STUB RPC (ตัดผลที่ max_rows เหมือน PostgREST)
+# =====================================================
+class _Res:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Rpc:
+    def __init__(self, rows, max_rows):
+        self.rows = rows
+        self.max_rows = max_rows
+        self.span = (0, len(rows) - 1)
+        self.request = type("Request", (), {"headers": {}})()
+
+    def range(self, start, end):
+        self.span = (start, end)
+        return self
+
+    def execute(self):
+        start, end = self.span
+        return _Res(self.rows[start:end + 1][:self.max_rows])
+
+
+def _circuits(lots, per_lot):
+    return [
+        {"lot_no": f"LOT{l}", "kanban_no": f"K{l}{i:04d}", "status": "REMAIN"}
+        for l in range(lots)
+        for i in range(per_lot)
+    ]
+
+
+class _Client:
+    def __init__(self, rows, max_rows):
+        self.rows = rows
+        self.max_rows = max_rows
+        self.calls = 0
+
+    def rpc(self, name, params):
+        self.calls += 1
+        lots = set(params["p_lot_nos"])
+        return _Rpc([r for r in self.rows if r["lot_no"] in lots], self.max_rows)
+
+
+# =====================================================
+# MULTI LOT : เกิน max-rows ต้องได้ครบทุก lot
+# =====================================================
+def test_lot_circuits_multi_pages_past_max_rows(monkeypatch):
+    monkeypatch.setattr(queries, "PAGE_SIZE", 10)
+    client = _Client(_circuits(lots=3, per_lot=12), max_rows=10)
+
+    df = queries.lot_circuits_multi(client, ["LOT0", "LOT1", "LOT2"])
+
+    assert len(df) == 36
+    assert df["kanban_no"].is_unique
+    assert df.groupby("lot_no").size().tolist() == [12, 12, 12]
+
+
+def test_lot_circuits_multi_single_page(monkeypatch):
+    monkeypatch.setattr(queries, "PAGE_SIZE", 10)
+    client = _Client(_circuits(lots=1, per_lot=4), max_rows=10)
+
+    df = queries.lot_circuits_multi(client, ["LOT0"])
+
+    assert len(df) == 4
+    assert client.calls == 1
+
+
+# =====================================================
+# LOT เดียว : KPI นับจากผลนี้ -> ต้องได้ครบแม้เกิน max-rows
+# =====================================================
+def test_lot_circuits_pages_past_max_rows(monkeypatch):
+    monkeypatch.setattr(queries, "PAGE_SIZE", 10)
+    client = _Client(_circuits(lots=2, per_lot=25), max_rows=10)
+
+    df = queries.lot_circuits(client, "LOT1")
+
+    assert len(df) == 25
+    assert df["kanban_no"].is_unique
+    assert set(df["lot_no"]) == {"LOT1"}
@@ -0,0 +1,89 @@
+import replica
+
+
+# =====================================================
+# STUB CLIENT (PostgREST : order + gte + range)
+# =====================================================
+class _Res:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    def __init__(self, rows):
+        self.rows = rows
+        self.filters = []
+        self.orders = []
+        self.span = None
+
+    def select(self, cols):
+        return self
+
+    def order(self, col, nullsfirst=False):
+        self.orders.append(col)
+        return self
+
+    def gte(self, col, value):
+        self.filters.append(lambda r: r.get(col) is not None and str(r[col]) >= value)
+        return self
+
+    def range(self, start, end):
+        self.span = (start, end)
+        return self
+
+    def execute(self):
+        rows = [r for r in self.rows if all(f(r) for f in self.filters)]
+        for col in reversed(self.orders):
+            rows.sort(key=lambda r: str(r.get(col) or ""))
+        start, end = self.span
+        return _Res(rows[start:end + 1])
+
+
+class _Client:
+    def __init__(self, tables):
+        self.tables = tables
+
+    def table(self, name):
+        return _Query(self.tables.get(name, []))
+
+
+def _deliveries(n, offset=0):
+    return [
+        {"kanban_no": f"K{i:04d}", "delivered_at": f"2026-01-01T08:{i // 60:02d}:{i % 60:02d}+00:00"}
+        for i in range(offset, offset + n)
+    ]
+
+
+def _count(path, table):
+    conn = replica.connect(path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+# =====================================================
+# DELTA SYNC : หลาย page ต้องไม่หลุดแถว
+# =====================================================
+def test_sync_pages_without_skipping_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(replica, "PAGE_SIZE", 10)
+    path = str(tmp_path / "replica.db")
+    client = _Client({"lot_master": [], "kanban_delivery": _deliveries(35)})
+
+    result = replica.sync(client, path)
+
+    assert result["kanban_delivery"] == 35
+    assert _count(path, "kanban_delivery") == 35
+
+
+def test_sync_delta_picks_up_new_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(replica, "PAGE_SIZE", 10)
+    path = str(tmp_path / "replica.db")
+    rows = _deliveries(35)
+    client = _Client({"lot_master": [], "kanban_delivery": rows})
+
+    replica.sync(client, path)
+    rows.extend(_deliveries(25, offset=35))
+    replica.sync(client, path)
+
+    assert _count(path, "kanban_delivery") == 60
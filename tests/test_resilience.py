@@ -0,0 +1,101 @@
+import threading
+import time
+
+import datacache
+import resilience
+
+
+def _loader(value, delay, calls):
+    def load():
+        calls.append(value)
+        time.sleep(delay)
+        return value
+    return load
+
+
+def _setup(monkeypatch):
+    monkeypatch.setattr(resilience, "TIMEOUT_SEC", 0.3)
+    monkeypatch.setattr(resilience, "TRIP_AFTER", 3)
+    datacache.invalidate()
+    resilience._breakers.clear()
+
+
+# =====================================================
+# STALE-WHILE-REVALIDATE
+# =====================================================
+def test_expired_entry_returns_at_once_and_revalidates(monkeypatch):
+    _setup(monkeypatch)
+    calls = []
+    resilience.read("ep", ("swr",), _loader("old", 0, calls), ttl=0.05)
+    time.sleep(0.1)
+
+    t0 = time.time()
+    result = resilience.read("ep", ("swr",), _loader("new", 0.2, calls), ttl=0.05)
+
+    assert time.time() - t0 < 0.1
+    assert result["value"] == "old"
+    assert result["stale"] and result["error"] is None
+
+    time.sleep(0.3)
+    assert datacache.entry(("swr",))["value"] == "new"
+    assert calls == ["old", "new"]
+
+
+# =====================================================
+# SINGLE-FLIGHT : ไม่ต่อคิวรอทีละ session
+# =====================================================
+def test_concurrent_misses_share_one_call_and_time_out_together(monkeypatch):
+    _setup(monkeypatch)
+    calls = []
+    waited = []
+
+    def session():
+        t0 = time.time()
+        try:
+            resilience.read("ep", ("flight",), _loader("v", 0.6, calls))
+        except resilience.Unavailable:
+            waited.append(time.time() - t0)
+
+    threads = [threading.Thread(target=session) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(waited) == 5
+    assert max(waited) < 0.5
+    assert calls == ["v"]
+
+
+# =====================================================
+# คนรอ timeout ไม่นับ strike : call ช้า 1 ครั้งไม่ทำให้ breaker เปิด
+# =====================================================
+def _state(name):
+    return next(b for b in resilience.status() if b["endpoint"] == name)
+
+
+def test_waiter_timeouts_do_not_trip_breaker(monkeypatch):
+    _setup(monkeypatch)
+    monkeypatch.setattr(resilience, "SLOW_SEC", 0.5)
+    calls = []
+
+    def session():
+        try:
+            resilience.read("trip", ("trip",), _loader("v", 0.6, calls))
+        except resilience.Unavailable:
+            pass
+
+    threads = [threading.Thread(target=session) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert _state("trip")["state"] == "closed"
+    assert _state("trip")["strikes"] == 0
+
+    # call ช้าเสร็จทีหลัง -> นับ 1 strike (ของ call เอง) breaker ยังปิด
+    time.sleep(0.5)
+    assert calls == ["v"]
+    assert _state("trip")["strikes"] == 1
+    assert _state("trip")["state"] == "closed"
@@ -0,0 +1,67 @@
+import scan_logic
+
+
+# =====================================================
+# STUB CLIENT (lot_master + kanban_delivery ในหน่วยความจำ)
+# =====================================================
+class _Res:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def select(self, cols):
+        return self
+
+    def eq(self, col, value):
+        self.rows = [r for r in self.rows if r[col] == value]
+        return self
+
+    def limit(self, n):
+        return self
+
+    def execute(self):
+        return _Res(self.rows)
+
+
+class _Rpc:
+    def __init__(self, client, kanban):
+        self.client = client
+        self.kanban = kanban
+
+    def execute(self):
+        self.client.rpc_calls += 1
+        self.client.tables["kanban_delivery"].append({"kanban_no": self.kanban})
+        return _Res([{"kanban_no": self.kanban}])
+
+
+class _Client:
+    def __init__(self):
+        self.tables = {"lot_master": [{"kanban_no": "K1"}], "kanban_delivery": []}
+        self.rpc_calls = 0
+
+    def table(self, name):
+        return _Query(list(self.tables[name]))
+
+    def rpc(self, name, params):
+        return _Rpc(self, params["p_kanban_no"])
+
+
+# =====================================================
+# ลบการส่งผิดแล้ว -> สแกนใหม่ได้ (ไม่ติด "สแกนแล้ว" จน restart)
+# =====================================================
+def test_deleted_delivery_can_be_scanned_again(monkeypatch):
+    client = _Client()
+
+    assert scan_logic.process_scan(client, "K1")["outcome"] == "single"
+    assert scan_logic.process_scan(client, "K1")["outcome"] == "duplicate"
+
+    # หัวหน้าลบแถวที่ส่งผิด + เลยช่วงที่จำไว้
+    client.tables["kanban_delivery"].clear()
+    monkeypatch.setattr(scan_logic, "DELIVERED_TTL_SEC", 0)
+
+    assert scan_logic.process_scan(client, "K1")["outcome"] == "single"
+    assert client.rpc_calls == 2
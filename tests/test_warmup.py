@@ -0,0 +1,59 @@
+import threading
+import time
+from datetime import date
+
+import datacache
+import resilience
+import warmup
+
+
+class _Client:
+    pass
+
+
+def _setup(monkeypatch):
+    datacache.invalidate()
+    resilience._breakers.clear()
+    monkeypatch.setattr(warmup.queries, "plan_kpi", lambda *a: {"row_count": 0})
+
+
+# =====================================================
+# warm-up กับหน้าที่เปิดพร้อมกัน -> call เดียว
+# =====================================================
+def test_warmup_shares_call_with_page_read(monkeypatch):
+    _setup(monkeypatch)
+    calls = []
+
+    def plan_rows(client, date_from, date_to):
+        calls.append(date_from)
+        time.sleep(0.2)
+        return ["row"]
+
+    monkeypatch.setattr(warmup.queries, "plan_rows", plan_rows)
+    today = date.today()
+
+    page = threading.Thread(target=lambda: resilience.read(
+        "v_plan_vs_actual", ("plan", today, today),
+        lambda: plan_rows(None, today, today)
+    ))
+    page.start()
+    time.sleep(0.05)
+
+    assert warmup._plan(_Client(), today) == ["row"]
+    page.join()
+    assert calls == [today]
+
+
+# =====================================================
+# breaker เปิด -> warm-up ไม่ยิง DB
+# =====================================================
+def test_warmup_respects_open_breaker(monkeypatch):
+    _setup(monkeypatch)
+    calls = []
+    monkeypatch.setattr(warmup.queries, "plan_rows", lambda *a: calls.append(1) or [])
+    resilience._breaker("v_plan_vs_actual")["opened_at"] = time.time()
+
+    steps = []
+    assert warmup._step(steps, "plan", lambda: warmup._plan(_Client(), date.today())) is None
+    assert "circuit open" in steps[0]["error"]
+    assert calls == []
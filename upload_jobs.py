@@ -0,0 +1,278 @@
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+
+# =====================================================
+# UPLOAD LOT MASTER : BACKGROUND JOB (resume ได้)
+# -----------------------------------------------------
+# กด Upload -> เขียนแถวลงไฟล์ในเครื่อง แล้ว upsert ทีละ chunk ใน thread
+#   <job>.rows.json : แถวที่ตัดซ้ำแล้ว (ไม่เปลี่ยนหลัง submit)
+#   <job>.json      : สถานะ + checkpoint (done_chunks = chunk ที่ commit แล้ว)
+# ปิด tab / rerun ไม่กระทบ job, process ตาย -> start ใหม่ทำต่อจาก checkpoint
+# upsert by kanban_no ซ้ำได้ -> chunk ที่ commit แล้วแต่ยังไม่ได้เขียน checkpoint
+# ส่งซ้ำได้ไม่เสียหาย
+# =====================================================
+BKK = ZoneInfo("Asia/Bangkok")
+JOB_DIR = ".upload_jobs"
+CHUNK_ROWS = 500
+KEEP_JOBS = 20
+
+REQUIRED_COLS = [
+    "lot_no",
+    "kanban_no",
+    "model_name",
+    "harness_part_no",
+    "wire_number",
+    "wire_harness_code",
+    "mc_a",
+    "mc_b",
+    "twist_mc",
+]
+
+ACTIVE = ("queued", "running")
+
+_lock = threading.Lock()
+_run_lock = threading.Lock()       # ทีละ job -> ไม่ยิง DB พร้อมกันหลายไฟล์
+_threads = {}
+
+
+def configure(job_dir=None, chunk_rows=None):
+    global JOB_DIR, CHUNK_ROWS
+    if job_dir:
+        JOB_DIR = job_dir
+    if chunk_rows:
+        CHUNK_ROWS = int(chunk_rows)
+
+
+def score(row):
+    # จำนวนคอลัมน์ที่มีข้อมูล (ใช้ตัดซ้ำในไฟล์ + เทียบกับของเดิมใน DB)
+    return sum(
+        1 for c in REQUIRED_COLS
+        if row.get(c) is not None and str(row.get(c)).strip() != ""
+    )
+
+
+# =====================================================
+# FILES
+# =====================================================
+def _path(job_id, suffix=".json"):
+    return os.path.join(JOB_DIR, f"{job_id}{suffix}")
+
+
+def _write(path, data):
+    # เขียนไฟล์ชั่วคราวแล้ว replace -> ไฟล์ไม่ขาดครึ่งแม้ process ตายกลางทาง
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save(job, **kw):
+    with _lock:
+        job.update(kw, updated_at=time.time())
+        _write(_path(job["id"]), job)
+
+
+def status(job_id):
+    try:
+        return _read(_path(job_id))
+    except (OSError, ValueError):
+        return None
+
+
+def jobs():
+    # ล่าสุดก่อน
+    if not os.path.isdir(JOB_DIR):
+        return []
+    out = []
+    for name in os.listdir(JOB_DIR):
+        if name.endswith(".json") and not name.endswith(".rows.json"):
+            job = status(name[:-len(".json")])
+            if job:
+                out.append(job)
+    return sorted(out, key=lambda j: j["created_at"], reverse=True)
+
+
+def active():
+    return any(j["state"] in ACTIVE for j in jobs())
+
+
+def version():
+    # เวลาที่ lot_master เปลี่ยนจาก upload ล่าสุด (job จบ / หยุดหลัง commit บาง chunk)
+    # ใช้เป็น key ของ cache ที่อิง lot_master (lot index) -> upload เสร็จแล้วเห็นทันที
+    return max(
+        (
+            j["updated_at"] for j in jobs()
+            if j["state"] not in ACTIVE and j["done_chunks"]
+        ),
+        default=None
+    )
+
+
+def _prune():
+    # เก็บประวัติ KEEP_JOBS ล่าสุด (job ที่ยังไม่เสร็จไม่ลบ)
+    for job in jobs()[KEEP_JOBS:]:
+        if job["state"] in ACTIVE:
+            continue
+        for suffix in (".json", ".rows.json"):
+            try:
+                os.remove(_path(job["id"], suffix))
+            except OSError:
+                pass
+
+
+# =====================================================
+# SUBMIT / RESUME
+# =====================================================
+def submit(client, file_name, rows):
+    os.makedirs(JOB_DIR, exist_ok=True)
+    _prune()
+
+    job_id = f"{datetime.now(BKK):%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+    _write(_path(job_id, ".rows.json"), rows)
+
+    job = {
+        "id": job_id,
+        "file": file_name,
+        "state": "queued",
+        "rows": len(rows),
+        "chunk_rows": CHUNK_ROWS,
+        "chunks": -(-len(rows) // CHUNK_ROWS),
+        "done_chunks": 0,
+        "success": 0,
+        "skipped": 0,
+        "error": None,
+        "resumed": 0,
+        "created_at": time.time(),
+        "updated_at": time.time(),
+    }
+    _write(_path(job_id), job)
+
+    _start(client, job_id)
+    return job_id
+
+
+def running(job_id):
+    with _lock:
+        t = _threads.get(job_id)
+    return bool(t and t.is_alive())
+
+
+def resume(client, job_id):
+    job = status(job_id)
+    if job is None or job["done_chunks"] >= job["chunks"] or running(job_id):
+        return False
+
+    _save(job, state="queued", error=None, resumed=job["resumed"] + 1)
+    return _start(client, job_id)
+
+
+def resume_all(client):
+    # ตอน process เริ่ม : job ที่ค้าง queued / running = process เก่าตายกลางทาง
+    resumed = []
+    for job in reversed(jobs()):
+        if job["state"] in ACTIVE and resume(client, job["id"]):
+            resumed.append(job["id"])
+    return resumed
+
+
+def _start(client, job_id):
+    with _lock:
+        t = _threads.get(job_id)
+        if t and t.is_alive():
+            return False
+        t = threading.Thread(
+            target=_run, args=(client, job_id), daemon=True, name=f"upload-{job_id}"
+        )
+        _threads[job_id] = t
+    t.start()
+    return True
+
+
+# =====================================================
+# RUN (ทีละ chunk -> checkpoint)
+# =====================================================
+def _chunk(client, rows):
+    kanbans = [r["kanban_no"] for r in rows]
+
+    # ของเดิมเฉพาะ kanban ใน chunk นี้
+    existing = (
+        client.table("lot_master")
+        .select(", ".join(REQUIRED_COLS))
+        .in_("kanban_no", kanbans)
+        .execute()
+        .data
+        or []
+    )
+    existing_map = {r["kanban_no"]: r for r in existing}
+
+    now = datetime.now(BKK).strftime("%Y-%m-%d %H:%M:%S")
+    payload = []
+    for r in rows:
+        old = existing_map.get(r["kanban_no"])
+
+        # ❌ ข้อมูลใหม่แย่กว่า → ข้าม
+        if old and score(r) < score(old):
+            continue
+
+        payload.append({
+            **{c: str(r.get(c, "")).strip() for c in REQUIRED_COLS},
+            "updated_at": now,
+        })
+
+    if payload:
+        client.table("lot_master").upsert(
+            payload,
+            on_conflict="kanban_no"
+        ).execute()
+
+    return len(payload), len(rows) - len(payload)
+
+
+def _run(client, job_id):
+    with _run_lock:
+        job = status(job_id)
+        if job is None or job["state"] not in ACTIVE:
+            return
+
+        try:
+            rows = _read(_path(job_id, ".rows.json"))
+        except (OSError, ValueError) as e:
+            _save(job, state="failed", error=f"rows file: {e}")
+            return
+
+        _save(job, state="running")
+        size = job["chunk_rows"]
+
+        for i in range(job["done_chunks"], job["chunks"]):
+            try:
+                success, skipped = _chunk(client, rows[i * size:(i + 1) * size])
+            except Exception as e:
+                # checkpoint เดิมยังอยู่ -> กด Resume ในหน้า Upload ทำต่อได้
+                _save(job, state="failed", error=str(e))
+                return
+
+            _save(
+                job,
+                done_chunks=i + 1,
+                success=job["success"] + success,
+                skipped=job["skipped"] + skipped,
+            )
+
+        _save(job, state="done")
+
+        # แถวไม่ต้องใช้แล้ว เก็บไว้แค่สถานะ
+        try:
+            os.remove(_path(job_id, ".rows.json"))
+        except OSError:
+            pass
@@ -0,0 +1,145 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import streamlit as st
+import pandas as pd
+
+import datacache
+import resilience
+import warmup
+from common import get_config
+
+
+BKK = ZoneInfo("Asia/Bangkok")
+
+STATE_LABEL = {
+    "idle": "⚪ ยังไม่เริ่ม",
+    "running": "🔄 กำลัง warm-up",
+    "done": "🟢 เสร็จ",
+    "failed": "🟠 เสร็จ (มีบางขั้นพัง)",
+}
+
+
+# =====================================================
+# 🛠️ ADMIN (สถานะระบบ)
+# =====================================================
+def render(supabase):
+    st.header("🛠️ Admin")
+
+    if st.text_input("Password", type="password") != "planner":
+        st.warning("❌ Planner only")
+        st.stop()
+
+    config = get_config()
+
+    # -------------------------------------------------
+    # WARM-UP ต้นกะ
+    # -------------------------------------------------
+    st.subheader("🔥 Shift Warm-up")
+
+    s = warmup.status()
+
+    k1, k2, k3, k4 = st.columns(4)
+    k1.metric("สถานะ", STATE_LABEL.get(s["state"], s["state"]))
+    k2.metric("⏱️ ใช้เวลา (s)", "-" if s["duration_sec"] is None else f"{s['duration_sec']:.2f}")
+    k3.metric("📦 Active Lots", s["lots"])
+    k4.metric("🔁 รันแล้ว", s["runs"])
+
+    started = f"{s['started_at']:%Y-%m-%d %H:%M:%S}" if s["started_at"] else "-"
+    next_run = f"{s['next_run']:%Y-%m-%d %H:%M}" if s["next_run"] else "-"
+
+    st.caption(f"รอบล่าสุด: {s['reason'] or '-'} | เริ่ม {started} | รอบถัดไป {next_run}")
+    st.caption(
+        f"⏰ เวลาเริ่มกะ {config['warmup_times']} | "
+        f"keep warm {config['warmup_window_min']} นาที | "
+        f"cache TTL {config['cache_ttl_sec']} s"
+    )
+
+    if s["steps"]:
+        st.dataframe(
+            pd.DataFrame(s["steps"]),
+            use_container_width=True,
+            hide_index=True
+        )
+
+    if st.button("🔥 Warm up now", disabled=s["state"] == "running"):
+        warmup.run_async(supabase, "manual (Admin)")
+        st.toast("เริ่ม warm-up แล้ว")
+
+    # -------------------------------------------------
+    # READ BREAKERS
+    # -------------------------------------------------
+    st.subheader("🧯 Read Circuit Breakers")
+    st.caption(
+        f"timeout {config['read_timeout_sec']:.0f} s | "
+        f"ช้า > {config['slow_call_sec']:.0f} s หรือพัง ติดกัน "
+        f"{config['breaker_trip_after']} ครั้ง -> เปิด {config['breaker_cooldown_sec']:.0f} s"
+    )
+
+    breakers = resilience.status()
+    if breakers:
+        st.dataframe(
+            pd.DataFrame(breakers),
+            use_container_width=True,
+            hide_index=True
+        )
+    else:
+        st.info("ยังไม่มีการเรียก read")
+
+    # -------------------------------------------------
+    # LOCAL REPLICA (ถ้าเปิดใช้)
+    # -------------------------------------------------
+    if config["replica_path"]:
+        import replica
+
+        st.subheader("🗃️ Local Replica")
+
+        r = replica.status(config["replica_path"])
+        last_ok = (
+            f"{datetime.fromtimestamp(r['last_ok'], BKK):%Y-%m-%d %H:%M:%S}"
+            if r.get("last_ok") else "-"
+        )
+
+        r1, r2, r3 = st.columns(3)
+        r1.metric("✅ Sync ล่าสุด", last_ok)
+        r2.metric("❌ พังติดกัน", r.get("failures", 0))
+        r3.metric(
+            "📥 แถวรอบล่าสุด",
+            sum((r.get("fetched") or {}).values()) if r.get("fetched") else "-"
+        )
+
+        st.caption(f"{config['replica_path']} | sync ทุก {config['replica_sync_sec']} s")
+        if r.get("last_error"):
+            st.error(f"❌ Sync failed: {r['last_error']}")
+
+    # -------------------------------------------------
+    # SHARED CACHE
+    # -------------------------------------------------
+    st.subheader("🗄️ Shared Cache")
+
+    c = datacache.stats()
+    mb = 2**20
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("📦 Entries", c["entries"])
+    c2.metric("💾 ใช้ / งบ (MB)", f"{c['bytes'] / mb:,.1f} / {c['max_bytes'] / mb:,.0f}")
+    c3.metric("🎯 Hit Rate", f"{c['hit_rate']:.1f}%")
+    c4.metric("🗑️ Evictions", c["evictions"])
+
+    st.caption(
+        f"hit {c['hits']:,} | miss {c['misses']:,} | "
+        f"เกินงบ -> ทิ้ง entry ที่ไม่ได้ใช้นานที่สุดก่อน (ล่างสุดของตาราง)"
+    )
+
+    rows = datacache.entries()
+    if rows:
+        st.dataframe(
+            pd.DataFrame(rows),
+            use_container_width=True,
+            hide_index=True,
+            height=240
+        )
+
+    if st.button("🧹 Clear cache"):
+        datacache.invalidate()
+        st.rerun()
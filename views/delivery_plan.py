@@ -0,0 +1,289 @@
+import streamlit as st
+import pandas as pd
+
+import prefetch
+import queries
+import replica
+import resilience
+from common import freshness_badge, get_config, use_replica
+from helpers import to_gmt7
+
+
+# =====================================================
+# KPI (sql/rpc_plan_kpi.sql)
+# =====================================================
+def load_plan_kpi(supabase, date_from, date_to, keyword):
+    try:
+        return resilience.read(
+            "rpc_plan_kpi",
+            ("plan_kpi", date_from, date_to, keyword.strip()),
+            lambda: queries.plan_kpi(supabase, date_from, date_to, keyword)
+        )["value"]
+    except Exception:
+        return None
+
+
+def kpi_from_frame(df):
+    return {
+        "plan_qty": df["plan_qty"].sum(),
+        "actual_qty": df["actual_qty"].sum(),
+        "pending_count": int((df["delivery_status"] == "🔴 PENDING").sum()),
+        "partial_count": int((df["delivery_status"] == "🟡 PARTIAL").sum()),
+        "delivered_count": int((df["delivery_status"] == "🟢 DELIVERED").sum()),
+        "row_count": len(df),
+    }
+
+
+def render_kpi(kpi):
+    plan_qty = float(kpi["plan_qty"] or 0)
+    actual_qty = float(kpi["actual_qty"] or 0)
+
+    k1, k2, k3 = st.columns(3)
+
+    k1.metric("📦 Plan Kanban", int(plan_qty))
+    k2.metric("✅ Delivered Kanban", int(actual_qty))
+
+    overall = (
+        actual_qty / plan_qty * 100
+        if plan_qty > 0 else 0
+    )
+    k3.metric("📊 Overall Progress", f"{overall:.1f}%")
+
+    st.caption(
+        f"🔴 PENDING {kpi['pending_count']} | "
+        f"🟡 PARTIAL {kpi['partial_count']} | "
+        f"🟢 DELIVERED {kpi['delivered_count']}"
+    )
+
+    st.divider()
+
+
+# =====================================================
+# 📅 DELIVERY PLAN (Plan vs Actual) – PRODUCTION
+# =====================================================
+def render(supabase):
+    replica_path = get_config()["replica_path"]
+    from_replica = use_replica()
+
+    st.header("📅 Delivery Plan (Plan vs Actual)")
+    st.caption("Kanban-driven | 1 Kanban = 1 Unit")
+
+    # -------------------------------------------------
+    # 🔍 SEARCH
+    # -------------------------------------------------
+    keyword = st.text_input(
+        "🔍 ค้นหา (Lot / Part Number / Model)",
+        placeholder="เช่น LOT260105, 4003120XKM15A, MODEL-A"
+    )
+
+    # -------------------------------------------------
+    # 📅 DATE FILTER
+    # -------------------------------------------------
+    c1, c2 = st.columns(2)
+    with c1:
+        date_from = st.date_input("📅 Plan Delivery From")
+    with c2:
+        date_to = st.date_input("📅 Plan Delivery To")
+
+    # -------------------------------------------------
+    # KPI (aggregate RPC -> แสดงก่อนโหลดตาราง)
+    # -------------------------------------------------
+    kpi_box = st.container()
+    kpi = load_plan_kpi(supabase, date_from, date_to, keyword)
+
+    if kpi is not None:
+        with kpi_box:
+            render_kpi(kpi)
+
+        if not kpi["row_count"]:
+            st.warning("⚠️ ไม่พบข้อมูลตามเงื่อนไขที่เลือก")
+            st.stop()
+
+    # -------------------------------------------------
+    # LOAD DATA (DB = SOURCE OF TRUTH)
+    # -------------------------------------------------
+    try:
+        result = resilience.read(
+            "v_plan_vs_actual",
+            ("plan", date_from, date_to),
+            lambda: queries.plan_rows(supabase, date_from, date_to)
+        )
+    except Exception as e:
+        st.error(f"❌ Load Delivery Plan failed: {e}")
+        st.stop()
+
+    freshness_badge(result)
+    # view ของ DataFrame ใน cache ร่วม (copy-on-write) -> แก้ได้โดยไม่กระทบ session อื่น
+    df = result["value"]
+
+    if df.empty:
+        st.warning("⚠️ ไม่พบข้อมูล Delivery Plan")
+        st.stop()
+
+    # -------------------------------------------------
+    # DATE CLEAN
+    # -------------------------------------------------
+    df["plan_delivery_dt"] = pd.to_datetime(
+        df["plan_delivery_dt"], errors="coerce"
+    )
+
+    df = df[
+        (df["plan_delivery_dt"] >= pd.to_datetime(date_from)) &
+        (df["plan_delivery_dt"] <= pd.to_datetime(date_to))
+    ]
+
+    # -------------------------------------------------
+    # KEYWORD FILTER (Lot / Part / Model)
+    # -------------------------------------------------
+    if keyword:
+        kw = keyword.strip().lower()
+        df = df[
+            df["lot_no"].astype(str).str.lower().str.contains(kw) |
+            df["part_number"].astype(str).str.lower().str.contains(kw) |
+            df["model_level"].astype(str).str.lower().str.contains(kw)
+        ]
+
+    if df.empty:
+        st.warning("⚠️ ไม่พบข้อมูลตามเงื่อนไขที่เลือก")
+        st.stop()
+
+    # -------------------------------------------------
+    # CALCULATION (READ-ONLY)
+    # -------------------------------------------------
+    df["actual_qty"] = df["actual_qty"].fillna(0)
+
+    df["progress_pct"] = (
+        df["actual_qty"] / df["plan_qty"] * 100
+    ).round(1)
+
+    df["delivery_status"] = df.apply(
+        lambda r:
+            "🟢 DELIVERED" if r["actual_qty"] >= r["plan_qty"]
+            else "🟡 PARTIAL" if r["actual_qty"] > 0
+            else "🔴 PENDING",
+        axis=1
+    )
+
+    status_order = {
+        "🔴 PENDING": 0,
+        "🟡 PARTIAL": 1,
+        "🟢 DELIVERED": 2
+    }
+    df["status_order"] = df["delivery_status"].map(status_order)
+
+    df = df.sort_values(
+        by=["status_order", "plan_delivery_dt", "lot_no"],
+        ascending=[True, True, True]
+    )
+
+    # RPC ยังไม่ได้ติดตั้ง -> คำนวณ KPI จากตารางแบบเดิม
+    if kpi is None:
+        with kpi_box:
+            render_kpi(kpi_from_frame(df))
+
+    # -------------------------------------------------
+    # 📋 MAIN TABLE
+    # -------------------------------------------------
+    st.subheader("📋 Delivery Plan Summary")
+
+    st.dataframe(
+        df[
+            [
+                "delivery_status",
+                "lot_no",
+                "part_number",
+                "part_name",
+                "model_level",
+                "plan_qty",
+                "actual_qty",
+                "progress_pct",
+                "plan_delivery_dt",
+                "plan_assembly_date",
+                "remark",
+                "last_delivered_at"
+            ]
+        ],
+        use_container_width=True,
+        height=460
+    )
+
+    st.caption("📊 Source: v_plan_vs_actual | Kanban-driven")
+
+    # =================================================
+    # 🔎 DRILL DOWN – KANBAN NOT DELIVERED
+    # =================================================
+    st.divider()
+    st.subheader("🔎 Drill Down : Kanban ยังไม่ส่ง")
+
+    # เฉพาะคู่ (lot, part) ที่มีอยู่จริงใน plan ที่แสดงอยู่
+    pairs = df[["lot_no", "part_number"]].drop_duplicates()
+    lot_list = sorted(pairs["lot_no"].unique().tolist())
+
+    if not from_replica:
+        # โหลดล่วงหน้าทุก lot ที่แสดง (ตามลำดับ PENDING ก่อน) 1 call
+        # ครั้งเดียวต่อชุด plan -> เปลี่ยน Lot / Part / checkbox ไม่ยิงซ้ำ
+        plan_id = (result["as_of"], tuple(pairs["lot_no"].drop_duplicates()))
+        if st.session_state.get("plan_prefetched") != plan_id:
+            st.session_state.plan_prefetched = plan_id
+            prefetch.prefetch(supabase, pairs["lot_no"].tolist())
+
+    c1, c2 = st.columns(2)
+    selected_lot = c1.selectbox("Lot", lot_list)
+    part_list = sorted(
+        pairs.loc[pairs["lot_no"] == selected_lot, "part_number"].tolist()
+    )
+    selected_part = c2.selectbox("Part Number", part_list)
+
+    show_all = st.checkbox(
+        "แสดง Kanban ทั้งหมด (รวมที่ส่งแล้ว)",
+        value=False
+    )
+
+    if selected_lot and selected_part:
+
+        if from_replica:
+            ddf = replica.part_tracking(
+                replica_path, selected_lot, selected_part
+            )
+        else:
+            with st.spinner("⏳ โหลดข้อมูล Kanban..."):
+                try:
+                    ddf = prefetch.get(
+                        supabase, selected_lot, selected_part,
+                        timeout=resilience.TIMEOUT_SEC
+                    )
+                except Exception as e:
+                    st.error(f"❌ Load Kanban detail failed: {e}")
+                    st.stop()
+
+        if ddf.empty:
+            st.warning("ไม่พบ Kanban สำหรับ Lot / Part นี้")
+        else:
+            ddf["Delivered At (GMT+7)"] = ddf["delivered_at"].apply(to_gmt7)
+            ddf["Status"] = ddf["sent"].apply(
+                lambda x: "✅ Sent" if x else "⏳ Remaining"
+            )
+
+            if not show_all:
+                ddf = ddf[ddf["sent"] == False]
+
+            st.dataframe(
+                ddf[
+                    [
+                        "kanban_no",
+                        "model_name",
+                        "harness_part_no",
+                        "wire_number",
+                        "Status",
+                        "Delivered At (GMT+7)"
+                    ]
+                ].sort_values(
+                    by="kanban_no"
+                ),
+                use_container_width=True,
+                height=420
+            )
+
+            st.caption(
+                f"📦 Lot {selected_lot} | Part {selected_part} | Remaining-first view"
+            )
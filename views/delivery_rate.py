@@ -0,0 +1,125 @@
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+import streamlit as st
+import pandas as pd
+
+import resilience
+from common import freshness_badge
+
+
+BKK = ZoneInfo("Asia/Bangkok")
+CHART_POINTS = 300
+
+GRAIN_LABEL = {
+    None: "⚙️ Auto",
+    "minute": "นาที",
+    "hour": "ชั่วโมง",
+    "shift": "กะ (08:00 / 20:00)",
+}
+
+
+# =====================================================
+# LOAD (sql/delivery_rate.sql -> rpc_delivery_rate)
+# =====================================================
+def load_rate(supabase, date_from, date_to, lot_no, part_no, grain):
+    start = datetime.combine(date_from, time(0), BKK)
+    end = datetime.combine(date_to + timedelta(days=1), time(0), BKK)
+
+    result = resilience.read(
+        "rpc_delivery_rate",
+        ("delivery_rate", date_from, date_to, lot_no, part_no, grain),
+        lambda: supabase.rpc(
+            "rpc_delivery_rate",
+            {
+                "p_from": start.isoformat(),
+                "p_to": end.isoformat(),
+                "p_lot_no": lot_no or None,
+                "p_harness_part_no": part_no or None,
+                "p_grain": grain,
+                "p_points": CHART_POINTS
+            }
+        ).execute().data or []
+    )
+    freshness_badge(result)
+
+    df = pd.DataFrame(result["value"], columns=["bucket", "kanbans", "grain", "bucket_sec"])
+    if df.empty:
+        return df
+
+    df["bucket"] = (
+        pd.to_datetime(df["bucket"], utc=True)
+          .dt.tz_convert(BKK)
+          .dt.tz_localize(None)
+    )
+    df["kanbans"] = pd.to_numeric(df["kanbans"], errors="coerce").fillna(0)
+    df["bucket_sec"] = pd.to_numeric(df["bucket_sec"], errors="coerce")
+    df["per_hour"] = (df["kanbans"] / (df["bucket_sec"] / 3600)).round(1)
+    return df
+
+
+# =====================================================
+# 📈 DELIVERY RATE (kanban ส่งแล้ว ต่อช่วงเวลา)
+# =====================================================
+def render(supabase):
+
+    st.header("📈 Delivery Rate")
+    st.caption("จำนวน Kanban ที่ส่งต่อช่วงเวลา | rollup อัปเดตทุกครั้งที่ scan")
+
+    c1, c2, c3, c4, c5 = st.columns(5)
+    date_from = c1.date_input("📅 จากวันที่", date.today() - timedelta(days=6))
+    date_to = c2.date_input("📅 ถึงวันที่", date.today())
+    f_lot = c3.text_input("Lot No")
+    f_part = c4.text_input("Harness Part No")
+    grain = c5.selectbox("ความละเอียด", list(GRAIN_LABEL), format_func=GRAIN_LABEL.get)
+
+    if date_from > date_to:
+        st.warning("⚠️ วันที่เริ่มต้องไม่เกินวันที่สิ้นสุด")
+        st.stop()
+
+    try:
+        df = load_rate(
+            supabase, date_from, date_to,
+            f_lot.strip(), f_part.strip(), grain
+        )
+    except Exception as e:
+        st.error(f"❌ Load delivery rate failed: {e}")
+        st.stop()
+
+    if df.empty:
+        st.info("ยังไม่มีการส่งในช่วงนี้")
+        st.stop()
+
+    # -------------------------------------------------
+    # KPI
+    # -------------------------------------------------
+    hours = ((date_to - date_from).days + 1) * 24
+    peak = df.loc[df["per_hour"].idxmax()]
+
+    k1, k2, k3 = st.columns(3)
+    k1.metric("📦 Kanban ส่งแล้ว", int(df["kanbans"].sum()))
+    k2.metric("⏱️ เฉลี่ย / ชม.", f"{df['kanbans'].sum() / hours:,.1f}")
+    k3.metric("🚀 สูงสุด / ชม.", f"{peak['per_hour']:,.1f}", help=f"{peak['bucket']:%Y-%m-%d %H:%M}")
+
+    # -------------------------------------------------
+    # CHART (downsample ฝั่ง DB แล้ว ไม่เกิน CHART_POINTS จุด)
+    # -------------------------------------------------
+    width = int(df["bucket_sec"].iloc[0])
+    grain_used = df["grain"].iloc[0]
+
+    # ช่วงที่ไม่มีการส่ง DB ไม่คืนแถว -> เติม 0 ให้กราฟไม่ลากเส้นข้าม
+    series = (
+        df.set_index("bucket")["per_hour"]
+          .reindex(
+              pd.date_range(df["bucket"].min(), df["bucket"].max(), freq=f"{width}s"),
+              fill_value=0
+          )
+          .rename("Kanban / ชม.")
+    )
+
+    st.line_chart(series, height=360)
+
+    st.caption(
+        f"📊 Source: delivery_rate (rollup) | grain {grain_used} | "
+        f"1 จุด = {width // 60:,} นาที | {len(df)} จุด"
+    )
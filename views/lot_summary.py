@@ -0,0 +1,515 @@
+import re
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import streamlit as st
+import pandas as pd
+
+import lot_filter
+import lot_index
+import queries
+import replica
+import resilience
+import scan_logic
+import upload_jobs
+from common import freshness_badge, get_config, replica_caption, use_replica
+
+
+DETAIL_COLS = [
+    "lot_no",
+    "kanban_no",
+    "model_name",
+    "harness_part_no",
+    "wire_number",
+    "wire_harness_code",
+    "subpackage_number",
+    "cable_name",
+    "wire_length_mm",
+    "joint_a",
+    "joint_b",
+    "mc_a",
+    "mc_b",
+    "twist_mc",
+    "status",
+    "Delivered At (GMT+7)"
+]
+
+MAX_MULTI_LOTS = 100
+BKK = ZoneInfo("Asia/Bangkok")
+
+# lot_master ทั้งตาราง (หลาย page) -> ให้เวลามากกว่า read ปกติ
+INDEX_TIMEOUT_SEC = 60
+
+
+# =====================================================
+# LOT INDEX (cache 10 นาที ใช้ร่วมทุก session)
+# -----------------------------------------------------
+# upload_version เปลี่ยนเมื่อ Upload Lot Master ในเครื่องนี้เสร็จ -> โหลดใหม่
+# lot ที่ไม่อยู่ใน index (upload จากเครื่องอื่น) -> ค้นตามที่พิมพ์
+# =====================================================
+@st.cache_resource(ttl=600, max_entries=4, show_spinner="⏳ โหลดรายการ Lot...")
+def get_lot_index(_supabase, replica_path=None, upload_version=None):
+    if replica_path:
+        lots = replica.distinct_lots(replica_path)
+    else:
+        lots = resilience.call(
+            "lot_master",
+            lambda: lot_index.fetch_lots(_supabase),
+            timeout=INDEX_TIMEOUT_SEC
+        )
+    return lot_index.build(lots)
+
+
+def lot_index_or_empty(supabase, replica_path=None):
+    # index โหลดไม่ได้ -> ยังค้นด้วย lot ตรงตัวได้ (ไม่ cache ผลพัง)
+    try:
+        return get_lot_index(supabase, replica_path, upload_jobs.version())
+    except Exception:
+        st.caption("⚠️ โหลดรายการ Lot ไม่ได้ -> ใช้ Lot No. ตามที่พิมพ์")
+        return lot_index.build([])
+
+
+# =====================================================
+# LOT CIRCUITS (ทั้ง lot -> filter ในเครื่อง)
+# =====================================================
+def fetch_circuits(supabase, lot_no):
+    # seq ก่อนยิง query -> การส่งระหว่างโหลดยังถูกจับได้ด้วย has_new_delivery
+    seq = scan_logic.delivery_seq()
+    return {
+        "df": queries.lot_circuits(supabase, lot_no),
+        "delivery_seq": seq,
+    }
+
+
+def load_lot(supabase, lot_no, replica_path=None, fresh=False):
+    if replica_path:
+        entry = {
+            "df": replica.lot_circuits(replica_path, lot_no),
+            "delivery_seq": scan_logic.delivery_seq(),
+        }
+        source = replica_caption()
+        result = None
+    else:
+        # cache ร่วม (warm-up เติมไว้ต้นกะ) / fresh = กด Refresh หรือมีการส่งใหม่
+        result = resilience.read(
+            "rpc_lot_kanban_circuits_multi",
+            ("circuits", lot_no),
+            lambda: fetch_circuits(supabase, lot_no),
+            fresh=fresh
+        )
+        entry = result["value"]
+        source = "📊 Source: kanban_delivery + lot_master (RPC)"
+
+    return {
+        "lot": lot_no,
+        "frame": lot_filter.build(entry["df"]),
+        "source": source,
+        "delivery_seq": entry["delivery_seq"],
+        "loaded_at": result["as_of"] if result else time.time(),
+        "result": result,
+    }
+
+
+# =====================================================
+# MULTI LOT (หลาย lot -> call เดียว)
+# =====================================================
+def parse_lots(text):
+    return [t for t in re.split(r"[\s,;]+", text or "") if t]
+
+
+def read_lot_file(file):
+    if file.name.endswith(".txt"):
+        return parse_lots(file.getvalue().decode("utf-8", errors="ignore"))
+
+    if file.name.endswith(".csv"):
+        df = pd.read_csv(file, dtype=str)
+    else:
+        df = pd.read_excel(file, dtype=str)
+
+    cols = {str(c).strip().lower().replace(" ", "_"): c for c in df.columns}
+    col = cols.get("lot_no") or cols.get("lot") or df.columns[0]
+    return df[col].dropna().astype(str).str.strip().tolist()
+
+
+def resolve_lots(index, texts):
+    # คืน (lot ที่ resolve ได้ตามลำดับที่ใส่, ข้อความที่กำกวม)
+    lots, missing = [], []
+    for text in texts:
+        found = lot_index.resolve(index, text)
+        if not found and not lot_index.complete(index, text, 2):
+            # ไม่อยู่ใน index (หรือ index ว่าง) -> ใช้ตามที่พิมพ์ ให้ DB ตัดสิน
+            found = [text]
+
+        if len(found) == 1:
+            if found[0] not in lots:
+                lots.append(found[0])
+        elif text not in missing:
+            missing.append(text)
+
+    return lots, missing
+
+
+def fetch_circuits_multi(supabase, lots):
+    seq = scan_logic.delivery_seq()
+    return {
+        "df": queries.lot_circuits_multi(supabase, lots),
+        "delivery_seq": seq,
+        "source": "📊 Source: kanban_delivery + lot_master (RPC multi-lot)",
+    }
+
+
+def load_lots(supabase, lots, replica_path=None, fresh=False):
+    if replica_path:
+        entry = {
+            "df": replica.lot_circuits_multi(replica_path, lots),
+            "delivery_seq": scan_logic.delivery_seq(),
+            "source": replica_caption(),
+        }
+        result = None
+    else:
+        result = resilience.read(
+            "rpc_lot_kanban_circuits_multi",
+            ("circuits_multi", tuple(lots)),
+            lambda: fetch_circuits_multi(supabase, lots),
+            fresh=fresh
+        )
+        entry = result["value"]
+
+    return {
+        "lots": tuple(lots),
+        "frame": lot_filter.build(entry["df"]),
+        "source": entry["source"],
+        "delivery_seq": entry["delivery_seq"],
+        "loaded_at": result["as_of"] if result else time.time(),
+        "result": result,
+    }
+
+
+def is_expired(state):
+    # สแกนจาก scan_server / เครื่องอื่น ไม่ผ่าน scan_logic ของ process นี้
+    # -> ข้อมูลเก่ากว่า TTL ของ cache ร่วม โหลดใหม่เสมอ
+    return time.time() - state["loaded_at"] > get_config()["cache_ttl_sec"]
+
+
+@st.fragment(run_every="30s")
+def age_caption(loaded_at):
+    age_sec = time.time() - loaded_at
+    st.caption(
+        f"🕒 ข้อมูล ณ {datetime.fromtimestamp(loaded_at, BKK):%H:%M:%S} "
+        f"({int(age_sec // 60)} นาทีที่แล้ว) | "
+        f"โหลดใหม่อัตโนมัติเมื่อเกิน {get_config()['cache_ttl_sec']} s / กด 🔄 Refresh"
+    )
+
+    # เปิดหน้าค้างไว้ -> หมดอายุแล้ว rerun ทั้งหน้า 1 ครั้งต่อชุดข้อมูล (ไม่วน)
+    if age_sec > get_config()["cache_ttl_sec"] and st.session_state.get("lot_age_rerun") != loaded_at:
+        st.session_state.lot_age_rerun = loaded_at
+        st.rerun()
+
+
+def has_new_delivery(state):
+    # มีการสแกนส่ง kanban ของ lot นี้ใน process นี้ -> โหลดใหม่
+    delivered = scan_logic.delivered_since(state["delivery_seq"])
+    if delivered is None:
+        return True
+    if not delivered:
+        return False
+    return state["frame"]["df"]["kanban_no"].isin(delivered).any()
+
+
+# =====================================================
+# 2) LOT KANBAN SUMMARY (SOURCE OF TRUTH)
+# =====================================================
+def render_table(df):
+    df = df.copy()
+    df["Delivered At (GMT+7)"] = df["delivered_at_gmt7"].astype(str)
+
+    st.dataframe(
+        df[DETAIL_COLS],
+        use_container_width=True,
+        height=650
+    )
+
+
+def status_filter():
+    return st.selectbox(
+        "Status",
+        ["ALL", "SENT", "REMAIN"],
+        format_func=lambda x: {
+            "ALL": "📦 ทั้งหมด",
+            "SENT": "✅ ส่งแล้ว",
+            "REMAIN": "⏳ ยังไม่ส่ง"
+        }[x]
+    )
+
+
+def render(supabase):
+    replica_path = get_config()["replica_path"]
+    from_replica = use_replica()
+
+    st.header("📊 Lot Kanban Summary")
+
+    mode = st.radio(
+        "Mode",
+        ["📄 Lot เดียว", "📚 หลาย Lot"],
+        horizontal=True,
+        label_visibility="collapsed"
+    )
+    if mode == "📚 หลาย Lot":
+        render_multi(supabase, replica_path, from_replica)
+        return
+
+    c1, c2, c3, c4 = st.columns(4)
+    # scanner / วางจาก Excel มักติดช่องว่างท้าย -> ตัดครั้งเดียวตรงนี้
+    f_lot   = c1.text_input("Lot No.").strip()
+    f_model = c2.text_input("Model")
+    f_wire  = c3.text_input("Wire Number")
+    f_part  = c4.text_input("Harness Part No")
+
+    f_status = status_filter()
+
+    if not f_lot:
+        st.info("กรุณาใส่ Lot No.")
+        st.stop()
+
+    # =============================
+    # RESOLVE LOT (ยิง query เมื่อได้ lot เดียวเท่านั้น)
+    # =============================
+    index = lot_index_or_empty(supabase, replica_path if from_replica else None)
+
+    if index["keys"]:
+        lot, candidates = lot_index.lookup(index, f_lot)
+
+        if lot is None and not candidates:
+            # index อายุได้ถึง 10 นาที -> lot เพิ่ง upload อาจยังไม่อยู่ใน index
+            lot = f_lot
+            st.caption("🔎 ไม่อยู่ในรายการ Lot -> ค้นตาม Lot No. ที่พิมพ์")
+
+        if lot is None:
+            lot = st.selectbox(
+                f"🔎 พบ {len(candidates)} Lot ที่ขึ้นต้นด้วย '{f_lot}'",
+                candidates,
+                index=None,
+                placeholder="เลือก Lot"
+            )
+            if not lot:
+                st.stop()
+
+        if lot != f_lot:
+            st.caption(f"🔎 Lot: {lot}")
+
+        f_lot = lot
+
+    # =============================
+    # LOAD LOT (ครั้งเดียวต่อ lot)
+    # =============================
+    state = st.session_state.get("lot_summary")
+    fresh = False
+
+    if st.button("🔄 Refresh"):
+        state = None
+        fresh = True
+
+    if state is not None and state["lot"] == f_lot:
+        if has_new_delivery(state):
+            state = None
+            fresh = True
+        elif is_expired(state):
+            # cache ร่วมอาจมีชุดใหม่กว่าจาก session อื่น -> ไม่บังคับ fresh
+            state = None
+
+    if state is None or state["lot"] != f_lot:
+        with st.spinner(f"⏳ โหลด Lot {f_lot}..."):
+            try:
+                state = load_lot(
+                    supabase, f_lot, replica_path if from_replica else None, fresh
+                )
+            except Exception as e:
+                st.error(f"❌ Load Lot {f_lot} failed: {e}")
+                st.stop()
+        st.session_state.lot_summary = state
+
+    if state["result"]:
+        freshness_badge(state["result"])
+    age_caption(state["loaded_at"])
+
+    frame = state["frame"]
+
+    if frame["df"].empty:
+        st.warning(f"ไม่พบ Lot ที่ตรงกับ '{f_lot}'")
+        st.stop()
+
+    # =============================
+    # KPI (ใช้ข้อมูลจริงจาก kanban_delivery)
+    # =============================
+    kpi = lot_filter.kpi(frame, f_wire, f_part)
+
+    if not kpi["total_kanban"]:
+        st.warning("ไม่พบข้อมูล KPI")
+        st.stop()
+
+    k1, k2, k3 = st.columns(3)
+    k1.metric("📦 Total Kanban", int(kpi["total_kanban"]))
+    k2.metric("✅ Sent", int(kpi["sent_kanban"]))
+    k3.metric("⏳ Remaining", int(kpi["remaining_kanban"]))
+
+    st.divider()
+
+    # =============================
+    # DETAIL TABLE (filter ในเครื่อง)
+    # =============================
+    df = lot_filter.apply(frame, f_model, f_wire, f_part, f_status)
+
+    if df.empty:
+        st.warning("ไม่พบข้อมูลตามเงื่อนไข")
+        st.stop()
+
+    render_table(df)
+
+    st.caption(state["source"])
+
+
+# =====================================================
+# 📚 MULTI LOT (ต้นกะ : เช็คหลาย lot พร้อมกัน)
+# =====================================================
+def render_multi(supabase, replica_path, from_replica):
+
+    c1, c2 = st.columns([2, 1])
+    pasted = c1.text_area(
+        "Lot No. (วางได้หลาย lot : ขึ้นบรรทัดใหม่ / , / เว้นวรรค)",
+        height=120
+    )
+    file = c2.file_uploader("หรือ Upload รายการ Lot", ["csv", "xlsx", "txt"])
+
+    c1, c2, c3 = st.columns(3)
+    f_model = c1.text_input("Model")
+    f_wire  = c2.text_input("Wire Number")
+    f_part  = c3.text_input("Harness Part No")
+    f_status = status_filter()
+
+    texts = parse_lots(pasted)
+    if file:
+        try:
+            texts += read_lot_file(file)
+        except Exception as e:
+            st.error(f"❌ อ่านไฟล์ไม่สำเร็จ: {e}")
+            st.stop()
+
+    if not texts:
+        st.info("กรุณาใส่รายการ Lot No.")
+        st.stop()
+
+    # =============================
+    # RESOLVE LOTS
+    # =============================
+    index = lot_index_or_empty(supabase, replica_path if from_replica else None)
+    lots, missing = resolve_lots(index, texts)
+
+    if missing:
+        st.warning(f"Lot กำกวม {len(missing)} รายการ: {', '.join(missing)}")
+
+    if not lots:
+        st.stop()
+
+    if len(lots) > MAX_MULTI_LOTS:
+        st.warning(f"แสดงได้ครั้งละ {MAX_MULTI_LOTS} Lot -> ตัดเหลือ {MAX_MULTI_LOTS} Lot แรก")
+        lots = lots[:MAX_MULTI_LOTS]
+
+    # =============================
+    # LOAD ALL LOTS (call เดียว)
+    # =============================
+    state = st.session_state.get("lot_summary_multi")
+    fresh = False
+
+    if st.button("🔄 Refresh"):
+        state = None
+        fresh = True
+
+    if state is not None and state["lots"] == tuple(lots):
+        if has_new_delivery(state):
+            state = None
+            fresh = True
+        elif is_expired(state):
+            state = None
+
+    if state is None or state["lots"] != tuple(lots):
+        with st.spinner(f"⏳ โหลด {len(lots)} Lot..."):
+            try:
+                state = load_lots(
+                    supabase, lots, replica_path if from_replica else None, fresh
+                )
+            except Exception as e:
+                st.error(f"❌ Load lots failed: {e}")
+                st.stop()
+        st.session_state.lot_summary_multi = state
+
+    if state["result"]:
+        freshness_badge(state["result"])
+    age_caption(state["loaded_at"])
+
+    frame = state["frame"]
+
+    # lot ที่ค้นตามที่พิมพ์แต่ DB ไม่มี -> แจ้งแล้วไม่แสดงในตาราง
+    found = set(frame["df"]["lot_no"].dropna())
+    absent = [lot for lot in lots if lot not in found]
+    if absent:
+        st.warning(f"ไม่พบ {len(absent)} Lot: {', '.join(absent)}")
+        lots = [lot for lot in lots if lot in found]
+        if not lots:
+            st.stop()
+
+    # =============================
+    # KPI MATRIX (ต่อ lot)
+    # =============================
+    matrix = (
+        lot_filter.kpi_by_lot(frame, f_wire, f_part)
+        .reindex(lots, fill_value=0)
+        .rename_axis("lot_no")
+        .reset_index()
+    )
+    matrix["progress_pct"] = (
+        matrix["sent_kanban"] / matrix["total_kanban"].where(matrix["total_kanban"] > 0)
+        * 100
+    ).round(1).fillna(0)
+
+    k1, k2, k3, k4 = st.columns(4)
+    k1.metric("📚 Lots", len(lots))
+    k2.metric("📦 Total Kanban", int(matrix["total_kanban"].sum()))
+    k3.metric("✅ Sent", int(matrix["sent_kanban"].sum()))
+    k4.metric("⏳ Remaining", int(matrix["remaining_kanban"].sum()))
+
+    st.dataframe(
+        matrix,
+        use_container_width=True,
+        height=min(38 + 35 * len(matrix), 460),
+        column_config={
+            "progress_pct": st.column_config.ProgressColumn(
+                "Progress %", min_value=0, max_value=100, format="%.1f%%"
+            )
+        }
+    )
+
+    st.divider()
+
+    # =============================
+    # DRILL DOWN (จากข้อมูลที่โหลดแล้ว)
+    # =============================
+    st.subheader("🔎 Drill Down")
+
+    selected = st.selectbox(
+        "Lot",
+        lots,
+        format_func=lambda lot: (
+            f"{lot} | ⏳ {int(matrix.loc[matrix['lot_no'] == lot, 'remaining_kanban'].iloc[0])}"
+        )
+    )
+
+    df = lot_filter.apply(frame, f_model, f_wire, f_part, f_status)
+    df = df[df["lot_no"] == selected]
+
+    if df.empty:
+        st.warning("ไม่พบข้อมูลตามเงื่อนไข")
+    else:
+        render_table(df)
+
+    st.caption(state["source"])
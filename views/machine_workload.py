@@ -0,0 +1,192 @@
+from datetime import date, timedelta
+
+import streamlit as st
+import pandas as pd
+
+import resilience
+from common import freshness_badge
+
+
+PAGE_SIZE = 1000
+
+ROLE_LABEL = {
+    "mc_a": "MC A",
+    "mc_b": "MC B",
+    "twist_mc": "Twist MC",
+}
+
+
+# =====================================================
+# LOAD ROLLUPS (sql/machine_workload.sql)
+# =====================================================
+def fetch_all(query):
+    rows = []
+    start = 0
+    while True:
+        page = query.range(start, start + PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        start += PAGE_SIZE
+
+
+# =====================================================
+# 🏭 MACHINE WORKLOAD (mc_a / mc_b / twist_mc)
+# =====================================================
+def render(supabase):
+
+    st.header("🏭 Machine Workload")
+    st.caption("งานคงเหลือ / ส่งแล้ว ต่อเครื่องตัด | rollup อัปเดตทุกครั้งที่ upload และ scan")
+
+    # -------------------------------------------------
+    # ACTIVE LOTS (ยังมีงานค้าง)
+    # -------------------------------------------------
+    try:
+        result = resilience.read(
+            "machine_workload",
+            ("machine_workload",),
+            lambda: fetch_all(
+                supabase.table("machine_workload")
+                .select(
+                    "lot_no, machine_role, machine, remaining_circuits, "
+                    "sent_circuits, remaining_length_mm, sent_length_mm"
+                )
+                .gt("remaining_circuits", 0)
+                .order("machine_role")
+                .order("machine")
+                .order("lot_no")
+            )
+        )
+    except Exception as e:
+        st.error(f"❌ Load machine workload failed: {e}")
+        st.stop()
+
+    freshness_badge(result)
+    wl = pd.DataFrame(result["value"])
+
+    if wl.empty:
+        st.success("✅ ไม่มีงานค้างทุกเครื่อง")
+        st.stop()
+
+    for c in ["remaining_length_mm", "sent_length_mm"]:
+        wl[c] = pd.to_numeric(wl[c], errors="coerce").fillna(0)
+
+    wl["Role"] = wl["machine_role"].map(ROLE_LABEL).fillna(wl["machine_role"])
+
+    # -------------------------------------------------
+    # KPI
+    # -------------------------------------------------
+    k1, k2, k3, k4 = st.columns(4)
+    k1.metric("🏭 Machines", wl[["machine_role", "machine"]].drop_duplicates().shape[0])
+    k2.metric("📦 Active Lots", wl["lot_no"].nunique())
+    k3.metric("⏳ Remaining Circuits", int(wl["remaining_circuits"].sum()))
+    k4.metric("📏 Remaining Wire (m)", f"{wl['remaining_length_mm'].sum() / 1000:,.1f}")
+
+    st.divider()
+
+    # -------------------------------------------------
+    # PER MACHINE
+    # -------------------------------------------------
+    st.subheader("📋 Per Machine")
+
+    roles = st.multiselect(
+        "Machine Type",
+        list(ROLE_LABEL),
+        default=list(ROLE_LABEL),
+        format_func=lambda x: ROLE_LABEL[x]
+    )
+    wl = wl[wl["machine_role"].isin(roles)]
+
+    per_machine = (
+        wl.groupby(["Role", "machine"], as_index=False)
+          .agg(
+              lots=("lot_no", "nunique"),
+              remaining_circuits=("remaining_circuits", "sum"),
+              sent_circuits=("sent_circuits", "sum"),
+              remaining_length_mm=("remaining_length_mm", "sum"),
+              sent_length_mm=("sent_length_mm", "sum"),
+          )
+          .sort_values("remaining_circuits", ascending=False)
+    )
+    per_machine["progress_pct"] = (
+        per_machine["sent_circuits"]
+        / (per_machine["sent_circuits"] + per_machine["remaining_circuits"])
+        * 100
+    ).round(1)
+
+    st.dataframe(per_machine, use_container_width=True, height=360)
+
+    # -------------------------------------------------
+    # PER LOT (เครื่องที่เลือก)
+    # -------------------------------------------------
+    st.subheader("🔎 Per Lot")
+
+    machines = per_machine[["Role", "machine"]].apply(
+        lambda r: f"{r['Role']} | {r['machine']}", axis=1
+    ).tolist()
+
+    if machines:
+        selected = st.selectbox("Machine", machines)
+        role, machine = selected.split(" | ", 1)
+
+        st.dataframe(
+            wl[(wl["Role"] == role) & (wl["machine"] == machine)][
+                [
+                    "lot_no",
+                    "remaining_circuits",
+                    "sent_circuits",
+                    "remaining_length_mm",
+                    "sent_length_mm",
+                ]
+            ].sort_values("lot_no"),
+            use_container_width=True,
+            height=300
+        )
+
+    # -------------------------------------------------
+    # PER DAY (ส่งแล้ว)
+    # -------------------------------------------------
+    st.subheader("📅 Sent per Day")
+
+    days = st.slider("ย้อนหลัง (วัน)", 1, 60, 14)
+    since = date.today() - timedelta(days=days - 1)
+
+    daily_roles = roles or list(ROLE_LABEL)
+    try:
+        result = resilience.read(
+            "machine_workload_daily",
+            ("machine_workload_daily", since, tuple(daily_roles)),
+            lambda: fetch_all(
+                supabase.table("machine_workload_daily")
+                .select("work_date, machine_role, machine, sent_circuits, sent_length_mm")
+                .gte("work_date", since.isoformat())
+                .in_("machine_role", daily_roles)
+                .order("work_date")
+            )
+        )
+    except Exception as e:
+        st.error(f"❌ Load daily workload failed: {e}")
+        st.stop()
+
+    freshness_badge(result)
+    daily = pd.DataFrame(result["value"])
+
+    if daily.empty:
+        st.info("ยังไม่มีการส่งในช่วงนี้")
+    else:
+        daily["Machine"] = (
+            daily["machine_role"].map(ROLE_LABEL).fillna(daily["machine_role"])
+            + " | " + daily["machine"]
+        )
+        st.bar_chart(
+            daily.pivot_table(
+                index="work_date",
+                columns="Machine",
+                values="sent_circuits",
+                aggfunc="sum",
+                fill_value=0
+            ),
+            height=320
+        )
+
+    st.caption("📊 Source: machine_workload + machine_workload_daily (rollup)")
@@ -0,0 +1,184 @@
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import streamlit as st
+
+import queries
+import replica
+import resilience
+from common import freshness_badge, get_config, replica_caption, use_replica
+from helpers import to_gmt7
+
+
+STORE_MAX = 20
+BKK = ZoneInfo("Asia/Bangkok")
+
+SORT_OPTIONS = {
+    "🕒 ส่งล่าสุด": ("Delivered At (GMT+7)", False),
+    "🏷️ Kanban No": ("kanban_no", True),
+    "🔌 Wire Number": ("wire_number", True),
+}
+
+
+# =====================================================
+# LOAD (RPC / REPLICA) -> เก็บใน session
+# =====================================================
+def load_result(supabase, key, replica_path=None, fresh=False):
+    lot_no, harness_part_no = key
+
+    if replica_path:
+        df = replica.part_tracking(replica_path, lot_no, harness_part_no)
+        source = replica_caption()
+        result = {"as_of": time.time(), "stale": False, "error": None}
+    else:
+        result = resilience.read(
+            "rpc_part_tracking_lot_harness",
+            ("tracking", lot_no, harness_part_no),
+            lambda: queries.part_tracking(supabase, lot_no, harness_part_no),
+            fresh=fresh
+        )
+        df = result["value"]
+        source = (
+            "📊 Source: rpc_part_tracking_lot_harness | "
+            "ข้อมูลจริงจาก Lot Master + Kanban Delivery"
+        )
+
+    if not df.empty:
+        # =============================
+        # TIMEZONE (TH)
+        # =============================
+        df["Delivered At (GMT+7)"] = df["delivered_at"].apply(to_gmt7)
+        df["Status"] = df["sent"].apply(
+            lambda x: "Sent" if x else "Remaining"
+        )
+
+    return {
+        "df": df,
+        "source": source,
+        "loaded_at": result["as_of"],
+        "result": result,
+    }
+
+
+# =====================================================
+# 🧩 PART TRACKING (LOT / HARNESS)
+# =====================================================
+def render(supabase):
+    replica_path = get_config()["replica_path"]
+    from_replica = use_replica()
+
+    st.header("🧩 Part Tracking (Lot / Harness)")
+
+    c1, c2 = st.columns(2)
+    f_lot = c1.text_input("Lot No")
+    f_harness = c2.text_input("Harness Part No")
+
+    if not f_lot and not f_harness:
+        st.info("กรุณาใส่ Lot No หรือ Harness Part No อย่างน้อย 1 ช่อง")
+        st.stop()
+
+    key = (
+        f_lot.strip() if f_lot else None,
+        f_harness.strip() if f_harness else None
+    )
+
+    # =============================
+    # SESSION RESULT STORE (key = lot, harness)
+    # =============================
+    store = st.session_state.setdefault("part_tracking_results", {})
+
+    b1, b2, _ = st.columns([1, 1, 6])
+    load = b1.button("🔍 Load Data")
+    refresh = b2.button("🔄 Refresh", disabled=key not in store)
+
+    if (load and key not in store) or refresh:
+        store.pop(key, None)
+        try:
+            store[key] = load_result(
+                supabase, key, replica_path if from_replica else None, refresh
+            )
+        except Exception as e:
+            st.error(f"❌ Load Part Tracking failed: {e}")
+            st.stop()
+
+        while len(store) > STORE_MAX:
+            del store[next(iter(store))]
+
+    if key not in store:
+        st.stop()
+
+    entry = store[key]
+    df = entry["df"]
+    freshness_badge(entry["result"])
+
+    if df.empty:
+        st.warning("❌ ไม่พบข้อมูลตามเงื่อนไข")
+        st.stop()
+
+    age_min = int((time.time() - entry["loaded_at"]) // 60)
+    st.caption(
+        f"🕒 ข้อมูล ณ {datetime.fromtimestamp(entry['loaded_at'], BKK):%H:%M:%S} "
+        f"({age_min} นาทีที่แล้ว) | กด 🔄 Refresh เพื่อโหลดใหม่"
+    )
+
+    # =============================
+    # KPI
+    # =============================
+    total = len(df)
+    sent = int((df["sent"] == True).sum())
+    remaining = total - sent
+
+    k1, k2, k3 = st.columns(3)
+    k1.metric("📦 Total", total)
+    k2.metric("✅ Sent", sent)
+    k3.metric("⏳ Remaining", remaining)
+
+    st.divider()
+
+    # =============================
+    # FILTER STATUS + SORT (ในเครื่อง ไม่ยิง RPC)
+    # =============================
+    c1, c2 = st.columns([3, 1])
+    status_filter = c1.radio(
+        "แสดงข้อมูล",
+        ["ALL", "SENT", "REMAIN"],
+        horizontal=True,
+        format_func=lambda x: {
+            "ALL": "📦 ทั้งหมด",
+            "SENT": "✅ ส่งแล้ว",
+            "REMAIN": "⏳ ยังไม่ส่ง"
+        }[x]
+    )
+    sort_by = c2.selectbox("เรียงตาม", list(SORT_OPTIONS))
+
+    if status_filter == "SENT":
+        df = df[df["sent"] == True]
+    elif status_filter == "REMAIN":
+        df = df[df["sent"] == False]
+
+    # =============================
+    # DISPLAY TABLE
+    # =============================
+    col, ascending = SORT_OPTIONS[sort_by]
+    st.dataframe(
+        df[
+            [
+                "lot_no",
+                "kanban_no",
+                "model_name",
+                "harness_part_no",
+                "wire_number",
+                "Status",
+                "Delivered At (GMT+7)"
+            ]
+        ].sort_values(
+            by=col,
+            ascending=ascending,
+            na_position="last"
+        ),
+        use_container_width=True,
+        height=600
+    )
+
+    st.caption(entry["source"])
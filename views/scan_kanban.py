@@ -0,0 +1,142 @@
+import json
+import urllib.parse
+import urllib.request
+
+import streamlit as st
+
+from common import get_config
+from helpers import norm
+from scan_logic import process_scan
+
+
+# =====================================================
+# SCAN RESULT STYLE (BIG SCREEN)
+# =====================================================
+SCAN_CSS = """
+<style>
+.scan-result {
+    font-size: 42px;
+    font-weight: 800;
+    padding: 32px;
+    border-radius: 18px;
+    text-align: center;
+    line-height: 1.5;
+    margin-top: 24px;
+}
+
+/* 🟩 สแกนใหม่ ไม่มีพ่วง */
+.scan-green {
+    background-color: #e6f9f0;
+    color: #065f46;
+    border: 4px solid #10b981;
+}
+
+/* 🟦 สแกนใหม่ มีพ่วง */
+.scan-blue {
+    background-color: #e8f1ff;
+    color: #1e3a8a;
+    border: 4px solid #3b82f6;
+}
+
+/* 🟧 สแกนซ้ำ */
+.scan-orange {
+    background-color: #fff7ed;
+    color: #9a3412;
+    border: 4px solid #fb923c;
+}
+</style>
+"""
+
+
+# =====================================================
+# 1) SCAN KANBAN
+# =====================================================
+def render(supabase):
+    scan_service_url = get_config()["scan_service_url"]
+
+    st.markdown(SCAN_CSS, unsafe_allow_html=True)
+
+    st.header("✅ Scan Kanban")
+
+    css_map = {
+        "green": "scan-green",
+        "blue": "scan-blue",
+        "orange": "scan-orange",
+    }
+
+    def render_scan_result(color, text):
+        st.markdown(
+            f"""
+            <div class="scan-result {css_map[color]}">
+                {text}
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
+
+    # =============================
+    # DISPLAY ONLY (scan_server รับสแกนแทน)
+    # =============================
+    if scan_service_url:
+        station = st.query_params.get("station", "")
+        st.caption(f"📡 Scan service: {scan_service_url} | Station: {station or 'ALL'}")
+
+        @st.fragment(run_every="1s")
+        def scan_display():
+            query = urllib.parse.urlencode({
+                "since": st.session_state.get("scan_seq", 0),
+                "station": station,
+                # server restart -> seq เริ่มใหม่ ส่ง boot ให้ server รู้ว่า seq นี้ของรอบเก่า
+                "boot": st.session_state.get("scan_boot", ""),
+            })
+            try:
+                with urllib.request.urlopen(
+                    f"{scan_service_url}/recent?{query}", timeout=2
+                ) as r:
+                    rows = json.load(r)
+            except Exception as e:
+                st.warning(f"⚠️ เชื่อมต่อ scan service ไม่ได้: {e}")
+                return
+
+            if rows:
+                st.session_state.scan_seq = rows[-1]["seq"]
+                st.session_state.scan_boot = rows[-1].get("boot", "")
+                st.session_state.scan_last = rows[-1]
+
+            last = st.session_state.get("scan_last")
+            if last:
+                render_scan_result(last["color"], last["text"])
+                st.caption(
+                    f"Kanban {last['kanban_no']} | {last['elapsed_ms']} ms"
+                )
+
+        scan_display()
+
+    else:
+
+        def confirm_scan():
+            result = process_scan(supabase, norm(st.session_state.scan))
+            if result is None:
+                return
+
+            st.session_state.msg = (result["color"], result["text"])
+
+            # clear ช่อง scan
+            st.session_state.scan = ""
+
+        # =============================
+        # INPUT
+        # =============================
+        st.text_input(
+            "Scan Kanban No.",
+            key="scan",
+            on_change=confirm_scan
+        )
+
+        # =============================
+        # SCAN RESULT (BIG & COLOR)
+        # =============================
+        if "msg" in st.session_state:
+            color, text = st.session_state.msg
+            render_scan_result(color, text)
+            del st.session_state.msg
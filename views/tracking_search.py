@@ -0,0 +1,38 @@
+import streamlit as st
+
+import resilience
+from helpers import safe_df
+
+
+# =====================================================
+# 4) TRACKING SEARCH
+# =====================================================
+def render(supabase):
+    st.header("🔍 Tracking Search")
+
+    kanban = st.text_input("Kanban No.")
+    model = st.text_input("Model")
+    lot = st.text_input("Lot No.")
+
+    query = supabase.table("lot_master").select(
+        "kanban_no, model_name, lot_no"
+    )
+
+    if kanban:
+        query = query.ilike("kanban_no", f"%{kanban}%")
+    if model:
+        query = query.ilike("model_name", f"%{model}%")
+    if lot:
+        query = query.ilike("lot_no", f"%{lot}%")
+
+    try:
+        data = resilience.call(
+            "lot_master_search",
+            lambda: query.range(0, 50000).execute().data
+        )
+    except Exception as e:
+        st.error(f"❌ Tracking Search failed: {e}")
+        st.stop()
+
+    df = safe_df(data)
+    st.dataframe(df, use_container_width=True)
@@ -0,0 +1,191 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import streamlit as st
+import pandas as pd
+
+import upload_jobs
+
+
+BKK = ZoneInfo("Asia/Bangkok")
+POLL_SEC = 2
+
+STATE_LABEL = {
+    "queued": "⏳ รอคิว",
+    "running": "🔄 กำลังอัปโหลด",
+    "done": "🟢 เสร็จ",
+    "failed": "🟠 หยุดกลางทาง (Resume ได้)",
+}
+
+
+# =====================================================
+# JOB STATUS (poll ไฟล์สถานะของ upload_jobs)
+# =====================================================
+def job_panel(supabase):
+    job_id = st.session_state.get("upload_job")
+    job = upload_jobs.status(job_id) if job_id else None
+
+    if job:
+        st.subheader(f"📤 {job['file']}")
+        st.progress(
+            job["done_chunks"] / job["chunks"] if job["chunks"] else 1.0,
+            text=(
+                f"{STATE_LABEL.get(job['state'], job['state'])} | "
+                f"chunk {job['done_chunks']}/{job['chunks']} | "
+                f"สำเร็จ {job['success']} | ข้าม {job['skipped']}"
+            )
+        )
+
+        if job["state"] == "done":
+            st.success(f"✅ Upload สำเร็จ {job['success']} kanban")
+            if job["skipped"]:
+                st.warning(f"⏭️ ข้าม {job['skipped']} kanban (ข้อมูลเดิมครบกว่า)")
+        elif job["state"] == "failed":
+            st.error(f"❌ {job['error']}")
+
+    history = upload_jobs.jobs()
+    if history:
+        with st.expander(f"🗂️ Upload jobs ({len(history)})"):
+            st.dataframe(
+                pd.DataFrame([
+                    {
+                        "job": j["id"],
+                        "file": j["file"],
+                        "state": STATE_LABEL.get(j["state"], j["state"]),
+                        "chunks": f"{j['done_chunks']}/{j['chunks']}",
+                        "success": j["success"],
+                        "skipped": j["skipped"],
+                        "resumed": j["resumed"],
+                        "updated": f"{datetime.fromtimestamp(j['updated_at'], BKK):%Y-%m-%d %H:%M:%S}",
+                        "error": j["error"],
+                    }
+                    for j in history
+                ]),
+                use_container_width=True,
+                hide_index=True
+            )
+
+            failed = [j["id"] for j in history if j["state"] == "failed"]
+            if failed:
+                c1, c2 = st.columns([3, 1])
+                pick = c1.selectbox("Job ที่หยุดกลางทาง", failed, label_visibility="collapsed")
+                if c2.button("▶️ Resume"):
+                    upload_jobs.resume(supabase, pick)
+                    st.session_state.upload_job = pick
+                    st.rerun()
+
+    # job จบแล้ว -> rerun ทั้งหน้าให้หยุด poll
+    if st.session_state.get("upload_polling") and not upload_jobs.active():
+        st.session_state.upload_polling = False
+        st.rerun()
+
+
+
+
+# =====================================================
+# 5) UPLOAD LOT MASTER (SAFE / PRODUCTION VERSION)
+# =====================================================
+def render(supabase):
+    st.header("🔐 Upload Lot Master (Safe Replace)")
+
+    # -----------------------------
+    # PASSWORD
+    # -----------------------------
+    if st.text_input("Password", type="password") != "planner":
+        st.warning("❌ Planner only")
+        st.stop()
+
+    # -----------------------------
+    # JOB STATUS (ปิด tab / rerun ได้ job ยังทำต่อ)
+    # -----------------------------
+    polling = upload_jobs.active()
+    st.session_state.upload_polling = polling
+    st.fragment(run_every=POLL_SEC if polling else None)(job_panel)(supabase)
+
+    # -----------------------------
+    # FILE UPLOAD
+    # -----------------------------
+    file = st.file_uploader("Upload CSV / Excel", ["csv", "xlsx"])
+    if not file:
+        st.stop()
+
+    # -----------------------------
+    # READ FILE
+    # -----------------------------
+    try:
+        if file.name.endswith(".csv"):
+            df = pd.read_csv(file)
+        else:
+            df = pd.read_excel(file)
+    except Exception as e:
+        st.error(f"❌ อ่านไฟล์ไม่สำเร็จ: {e}")
+        st.stop()
+
+    st.success(f"📂 โหลดไฟล์สำเร็จ {len(df)} แถว")
+
+    # -----------------------------
+    # NORMALIZE HEADER (สำคัญมาก)
+    # -----------------------------
+    df.columns = (
+        df.columns
+          .str.strip()
+          .str.lower()
+    )
+
+    # -----------------------------
+    # REQUIRED COLUMNS (ตรง DB)
+    # -----------------------------
+    required_cols = upload_jobs.REQUIRED_COLS
+
+    missing = [c for c in required_cols if c not in df.columns]
+    if missing:
+        st.error(f"❌ ไฟล์ขาดคอลัมน์: {missing}")
+        st.stop()
+
+    # -----------------------------
+    # CLEAN DATA
+    # -----------------------------
+    df = df.fillna("")
+    df["kanban_no"] = df["kanban_no"].astype(str).str.strip()
+
+    # -----------------------------
+    # DEDUPLICATE (เลือกแถวที่ข้อมูลครบที่สุด)
+    # -----------------------------
+    df["_score"] = df.apply(upload_jobs.score, axis=1)
+
+    df = (
+        df.sort_values("_score", ascending=False)
+          .drop_duplicates(subset=["kanban_no"], keep="first")
+          .drop(columns="_score")
+    )
+
+    st.info(f"🧹 หลังตัดซ้ำ เหลือ {len(df)} kanban")
+    st.dataframe(df.head(10), use_container_width=True)
+
+    st.caption(
+        "📌 Logic: kanban ซ้ำ → ใช้แถวที่ข้อมูลครบกว่า | ไม่ลบของเดิม | "
+        f"อัปโหลดเบื้องหลังทีละ {upload_jobs.CHUNK_ROWS} แถว ปิดหน้านี้ได้"
+    )
+
+    # -----------------------------
+    # CONFIRM -> BACKGROUND JOB
+    # -----------------------------
+    if not st.button("🚀 Upload to Supabase", disabled=polling):
+        if polling:
+            st.caption("⏳ มี job กำลังอัปโหลดอยู่ รอให้เสร็จก่อน")
+        st.stop()
+
+    rows = (
+        df[required_cols]
+          .astype(str)
+          .apply(lambda s: s.str.strip())
+          .to_dict("records")
+    )
+
+    try:
+        st.session_state.upload_job = upload_jobs.submit(supabase, file.name, rows)
+    except Exception as e:
+        st.error(f"❌ สร้าง upload job ไม่สำเร็จ: {e}")
+        st.stop()
+
+    st.rerun()
@@ -0,0 +1,214 @@
+import threading
+import time
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import datacache
+import prefetch
+import queries
+import resilience
+import scan_logic
+
+
+# =====================================================
+# SHIFT-START WARM-UP (background thread)
+# -----------------------------------------------------
+# รันตอน process เริ่ม + ทุกเวลาเริ่มกะ (WARMUP_TIMES เช่น "08:00,20:00")
+# เติม cache ร่วมล่วงหน้า -> คนแรกของกะเร็วเท่าคนถัดไป
+#   plan      : v_plan_vs_actual ของวันนี้ + rpc_plan_kpi (ค่า default หน้า Delivery Plan)
+#   circuits  : วงจรของ lot ที่ยังส่งไม่ครบในแผนวันนี้ (หน้า Lot Kanban Summary)
+#               (drill-down หน้า Delivery Plan ใช้ key เดียวกัน -> prefetch.py)
+#   scan      : kanban ที่มีใน lot master / ส่งแล้ว (scan_logic cache)
+# ช่วง window หลังเริ่มกะ -> รันซ้ำทุกครึ่ง TTL ให้ cache ไม่หมดอายุช่วงคนเข้าเยอะ
+# โหลดผ่าน resilience.revalidate (name เดียวกับหน้า dashboard)
+#   -> หน้าเปิดพร้อม warm-up ใช้ call เดียวกัน, breaker เปิดอยู่ warm-up ก็ไม่ยิง
+# =====================================================
+BKK = ZoneInfo("Asia/Bangkok")
+DEFAULT_TIMES = "08:00,20:00"
+
+# warm-up รันใน thread ของตัวเอง -> รอได้นานกว่า read ของหน้า
+STEP_TIMEOUT_SEC = 120
+
+_status = {
+    "state": "idle",          # idle | running | done | failed
+    "reason": None,
+    "started_at": None,
+    "finished_at": None,
+    "duration_sec": None,
+    "steps": [],
+    "lots": 0,
+    "runs": 0,
+    "next_run": None,
+}
+_lock = threading.Lock()
+_run_lock = threading.Lock()
+
+
+def parse_times(text):
+    out = []
+    for part in (text or DEFAULT_TIMES).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        h, m = part.split(":")
+        out.append((int(h), int(m)))
+    return sorted(set(out))
+
+
+def next_shift(now, times):
+    for day in (0, 1):
+        for h, m in times:
+            at = (now + timedelta(days=day)).replace(
+                hour=h, minute=m, second=0, microsecond=0
+            )
+            if at > now:
+                return at
+    return now + timedelta(days=1)
+
+
+def status():
+    with _lock:
+        return {**_status, "steps": [dict(s) for s in _status["steps"]]}
+
+
+def _set(**kw):
+    with _lock:
+        _status.update(kw)
+
+
+# =====================================================
+# STEPS
+# =====================================================
+def _refresh(name, key, loader):
+    # โหลดใหม่เสมอ / มีคนกำลังโหลด key นี้อยู่ -> รอ call เดียวกัน
+    value, _ = resilience.revalidate(name, key, loader).result(timeout=STEP_TIMEOUT_SEC)
+    return value
+
+
+def _plan(client, today):
+    # key / name เดียวกับหน้า Delivery Plan (ค่า default)
+    df = _refresh(
+        "v_plan_vs_actual",
+        ("plan", today, today),
+        lambda: queries.plan_rows(client, today, today)
+    )
+    _refresh(
+        "rpc_plan_kpi",
+        ("plan_kpi", today, today, ""),
+        lambda: queries.plan_kpi(client, today, today, "")
+    )
+    return df
+
+
+def _active_lots(plan):
+    if plan.empty:
+        return []
+    pending = plan[plan["actual_qty"].fillna(0) < plan["plan_qty"]]
+    return pending["lot_no"].dropna().drop_duplicates().tolist()[:prefetch.MAX_LOTS]
+
+
+def _circuits(client, lots):
+    # 1 call ทุก lot แล้วแยกเก็บทีละ lot (key เดียวกับหน้า Lot Kanban Summary / drill-down)
+    entries = prefetch.wait(client, lots, timeout=STEP_TIMEOUT_SEC, fresh=True)
+
+    known, delivered = [], []
+    for entry in entries.values():
+        part = entry["df"]
+        known.extend(part["kanban_no"].dropna().tolist())
+        delivered.extend(part.loc[part["status"] == "SENT", "kanban_no"].dropna().tolist())
+
+    return known, delivered
+
+
+def _step(steps, name, fn, rows=len):
+    t0 = time.perf_counter()
+    entry = {"step": name, "rows": 0, "sec": None, "error": None}
+    with _lock:
+        steps.append(entry)
+
+    try:
+        result = fn()
+        entry["rows"] = rows(result)
+        return result
+    except Exception as e:
+        entry["error"] = str(e)
+        return None
+    finally:
+        entry["sec"] = round(time.perf_counter() - t0, 3)
+
+
+def run(client, reason="manual"):
+    # รันอยู่แล้ว (scheduler / ปุ่มในหน้า Admin) -> ไม่ซ้อน
+    if not _run_lock.acquire(blocking=False):
+        return status()
+
+    try:
+        t0 = time.perf_counter()
+        steps = []
+        _set(
+            state="running", reason=reason, steps=steps,
+            started_at=datetime.now(BKK), finished_at=None, duration_sec=None
+        )
+
+        # วันเดียวกับค่า default ของ st.date_input ในหน้า Delivery Plan
+        today = date.today()
+
+        _step(steps, "client", lambda: (
+            client.table("lot_master").select("kanban_no").limit(1).execute().data or []
+        ))
+        plan = _step(steps, "plan", lambda: _plan(client, today))
+
+        lots = _active_lots(plan) if plan is not None else []
+        scan = _step(
+            steps, "circuits", lambda: _circuits(client, lots),
+            rows=lambda r: len(r[0])
+        )
+        if scan is not None:
+            _step(
+                steps, "scan", lambda: scan_logic.preload(*scan),
+                rows=lambda _: len(scan[0])
+            )
+
+        failed = any(s["error"] for s in steps)
+        with _lock:
+            _status.update(
+                state="failed" if failed else "done",
+                finished_at=datetime.now(BKK),
+                duration_sec=round(time.perf_counter() - t0, 3),
+                lots=len(lots),
+                runs=_status["runs"] + 1,
+            )
+        return status()
+
+    finally:
+        _run_lock.release()
+
+
+def run_async(client, reason="manual"):
+    threading.Thread(
+        target=run, args=(client, reason), daemon=True, name="warmup"
+    ).start()
+
+
+# =====================================================
+# SCHEDULER
+# =====================================================
+def schedule(client, times=DEFAULT_TIMES, window_min=30, ttl_sec=None):
+    # blocking -> เรียกใน thread ของตัวเอง (common.start_warmup)
+    shifts = parse_times(times)
+    every = max(int(ttl_sec or datacache.TTL_SEC) // 2, 30)
+
+    run(client, "process start")
+
+    while True:
+        now = datetime.now(BKK)
+        at = next_shift(now, shifts)
+        _set(next_run=at)
+        time.sleep(max((at - now).total_seconds(), 1))
+
+        # ต้นกะ + รันซ้ำตลอด window ให้ cache ยังสดตอนคนเข้าพร้อมกัน
+        until = time.time() + window_min * 60
+        run(client, f"shift {at:%H:%M}")
+        while time.time() + every < until:
+            time.sleep(every)
+            run(client, f"shift {at:%H:%M} (keep warm)")